@@ -0,0 +1,224 @@
+import argparse
+import gc
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Dataset sizes benchmarked by default.
+BENCH_SIZES = [1_000, 100_000, 1_000_000]
+BENCH_DATASETS = ["uniform", "clustered", "city"]
+BENCH_STAGES = ["load", "cluster", "nearest", "map_html", "popups", "pdf"]
+# A stage this much slower than in the --compare baseline is flagged.
+REGRESSION_FACTOR = 1.2
+# Stages too slow for the largest datasets unless asked for explicitly.
+_SLOW_STAGES = {"cluster": 100_000, "pdf": 100_000}
+
+_DESCRIPTIONS = np.array(["tires", "construction debris", "household garbage", "mattress", "appliances",
+                          "yard waste", "paint cans", ""])
+
+
+# Synthetic reports in signed WGS84 degrees.
+#   uniform:   spread evenly over southern Ontario
+#   clustered: 200 tight dumping hotspots plus 10% background noise
+#   city:      dense Toronto core (~20 km) with neighbourhood hotspots
+def generate_reports(kind, n, seed=0):
+    rng = np.random.default_rng(seed)
+    if kind == "uniform":
+        lats, lons = rng.uniform(42.0, 46.0, n), rng.uniform(-83.0, -75.0, n)
+    elif kind == "clustered":
+        centers = rng.uniform([42.0, -83.0], [46.0, -75.0], size=(200, 2))
+        pts = centers[rng.integers(0, len(centers), n)] + rng.normal(0, 0.003, (n, 2))
+        noise = rng.random(n) < 0.1
+        pts[noise] = rng.uniform([42.0, -83.0], [46.0, -75.0], size=(noise.sum(), 2))
+        lats, lons = pts[:, 0], pts[:, 1]
+    elif kind == "city":
+        centers = np.array([43.6532, -79.3832]) + rng.normal(0, 0.08, (1000, 2))
+        pts = centers[rng.integers(0, len(centers), n)] + rng.normal(0, 0.002, (n, 2))
+        lats, lons = pts[:, 0], pts[:, 1]
+    else:
+        raise ValueError(f"unknown dataset {kind!r}")
+    days = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 540, n), unit="D")
+    return pd.DataFrame({
+        "lat": np.round(lats, 6),
+        "lon": np.round(lons, 6),
+        "date": days.strftime("%Y%m%d").astype(np.int64),
+        "description": _DESCRIPTIONS[rng.integers(0, len(_DESCRIPTIONS), n)],
+        "image": "",
+    })
+
+
+def generate_landfills(n=500, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "SITE_NAME": [f"Site {i}" for i in range(n)],
+        "LATITUDE": rng.uniform(42.0, 46.0, n),
+        "LONGITUDE": rng.uniform(-83.0, -75.0, n),
+    })
+
+
+# Resident set size of this process in bytes, or None where /proc is unavailable.
+def _rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+# Run fn once and return (seconds, peak memory growth in MB, result). Memory is
+# sampled from the process RSS on a background thread, which, unlike tracemalloc,
+# does not slow the measured code down.
+def measure(fn, interval=0.005):
+    gc.collect()
+    base = _rss()
+    peak = [base or 0]
+    stop = threading.Event()
+
+    def sample():
+        while not stop.wait(interval):
+            peak[0] = max(peak[0], _rss() or 0)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        sampler.join()
+    peak[0] = max(peak[0], _rss() or 0)
+    return elapsed, None if base is None else (peak[0] - base) / 1e6, result
+
+
+def _stage_load(store):
+    from data_loader import clear_cache, load_reports
+    clear_cache()
+    return load_reports(store)
+
+
+def _stage_cluster(store, df):
+    from hotspots import HotspotEngine, cluster_summary
+    engine = HotspotEngine(store)
+    engine.recompute()
+    labels = engine.labels(df["id"])
+    return cluster_summary(df["lat"], df["lon"], labels)
+
+
+def _stage_nearest(store, df, landfills, queries=200):
+    from nearest_dumps import DumpFinder
+    finder = DumpFinder(df, landfills, describe=lambda ids: store.details(ids, ["description"])["description"])
+    rng = np.random.default_rng(2)
+    for i in rng.integers(0, len(df), queries):
+        finder.nearest(df["lat"].iat[i], df["lon"].iat[i], k=5)
+    return finder
+
+
+# Report Incident map at the default Toronto view: viewport query, point layer and
+# the full HTML document folium sends to the browser.
+def _stage_map_html(df):
+    import folium
+    from map_layers import add_point_layer, aggregates
+    from viewport import MapIndex, bounds_around
+    center, zoom = [43.6532, -79.3832], 12
+    index = MapIndex(df["lat"], df["lon"], [], [])
+    visible, _ = index.visible(bounds_around(center, zoom))
+    shown = df.iloc[visible]
+    m = folium.Map(location=center, zoom_start=zoom)
+    popups = None if aggregates(len(shown), zoom) else [""] * len(shown)
+    add_point_layer(m, shown["lat"], shown["lon"], "red", radius=10, popups=popups, zoom=zoom)
+    return m.get_root().render()
+
+
+def _stage_popups(store, df):
+    from data_loader import with_details
+    from map_layers import generate_popups
+    return generate_popups(with_details(store, df))
+
+
+def _stage_pdf(store):
+    from pdf_export import export_reports_pdf
+    return export_reports_pdf(store)
+
+
+# Benchmark every requested stage on one synthetic dataset. Returns a list of
+# result rows.
+def run(kind, n, stages, workdir, include_slow=False):
+    from report_store import ReportStore
+    reports = generate_reports(kind, n)
+    landfills = generate_landfills()
+    store = ReportStore(os.path.join(workdir, f"{kind}_{n}.db"))
+    ingest, _, _ = measure(lambda: store.add_many(reports.itertuples(index=False, name=None)))
+    rows = [{"dataset": kind, "n": n, "stage": "ingest", "seconds": ingest, "peak_mb": None}]
+    df = None
+    for stage in stages:
+        if not include_slow and n > _SLOW_STAGES.get(stage, n):
+            continue
+        if stage == "load":
+            fn = lambda: _stage_load(store)
+        elif stage == "cluster":
+            fn = lambda: _stage_cluster(store, df)
+        elif stage == "nearest":
+            fn = lambda: _stage_nearest(store, df, landfills)
+        elif stage == "map_html":
+            fn = lambda: _stage_map_html(df)
+        elif stage == "popups":
+            fn = lambda: _stage_popups(store, df)
+        else:
+            fn = lambda: _stage_pdf(store)
+        if df is None:
+            df = _stage_load(store)
+        seconds, peak, _ = measure(fn)
+        rows.append({"dataset": kind, "n": n, "stage": stage, "seconds": seconds, "peak_mb": peak})
+    return rows
+
+
+def _key(row):
+    return row["dataset"], row["n"], row["stage"]
+
+
+def report(rows, baseline=None):
+    previous = {_key(row): row for row in baseline or []}
+    for row in rows:
+        peak = "" if row["peak_mb"] is None else f"{row['peak_mb']:10.1f} MB"
+        line = f"{row['dataset']:<10} {row['n']:>10,}  {row['stage']:<9} {row['seconds']:10.3f} s {peak}"
+        old = previous.get(_key(row))
+        if old is not None and old["seconds"] > 0:
+            ratio = row["seconds"] / old["seconds"]
+            line += f"  x{ratio:.2f} vs baseline" + ("  <-- REGRESSION" if ratio > REGRESSION_FACTOR else "")
+        print(line, flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the app's hot paths on synthetic reports, outside Streamlit.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES)
+    parser.add_argument("--datasets", nargs="+", choices=BENCH_DATASETS, default=BENCH_DATASETS)
+    parser.add_argument("--stages", nargs="+", choices=BENCH_STAGES, default=BENCH_STAGES)
+    parser.add_argument("--all", action="store_true",
+                        help="also run clustering and PDF export on datasets above 100k reports")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="flag stages slower than in this earlier --json result")
+    args = parser.parse_args()
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    workdir = tempfile.mkdtemp(prefix="greensight-bench-")
+    results = []
+    try:
+        for n in args.sizes:
+            for kind in args.datasets:
+                rows = run(kind, n, args.stages, workdir, include_slow=args.all)
+                report(rows, baseline)
+                results.extend(rows)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
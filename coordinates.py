@@ -0,0 +1,28 @@
+import numpy as np
+
+# Coordinates are signed WGS84 degrees everywhere (south and west negative): in the
+# report store, the landfill file, the browser's geolocation and on the maps. In
+# memory they are held as contiguous float32 arrays, 4 bytes a value with ~2 m of
+# resolution at worst; distances are still computed in float64 (see haversine).
+COORD_DTYPE = np.float32
+# Decimals kept when a coordinate is written back to the store (~0.1 m).
+COORD_DECIMALS = 6
+
+
+# Raise ValueError unless (lat, lon) is a finite position in range.
+def check_coordinates(lat, lon):
+    if not np.isfinite(lat) or not -90.0 <= lat <= 90.0:
+        raise ValueError(f"latitude out of range: {lat}")
+    if not np.isfinite(lon) or not -180.0 <= lon <= 180.0:
+        raise ValueError(f"longitude out of range: {lon}")
+
+
+# (lats, lons) as contiguous float32 arrays; no copy when they already are.
+def coordinate_arrays(lats, lons):
+    return (np.ascontiguousarray(lats, dtype=COORD_DTYPE),
+            np.ascontiguousarray(lons, dtype=COORD_DTYPE))
+
+
+# A coordinate taken from an in-memory array as a plain float for the store.
+def stored_coordinate(value):
+    return round(float(value), COORD_DECIMALS)
@@ -0,0 +1,107 @@
+import os
+import threading
+
+import pandas as pd
+
+from coordinates import COORD_DTYPE
+from snapshots import read_fresh_snapshot
+
+LANDFILL_COLUMNS = ["SITE_NAME", "LATITUDE", "LONGITUDE"]
+LANDFILL_DTYPES = {"SITE_NAME": "string", "LATITUDE": COORD_DTYPE, "LONGITUDE": COORD_DTYPE}
+
+# The report frame shared by every page holds only fixed-width columns: about 22
+# bytes a report instead of several hundred with the text columns. Dates stay
+# YYYYMMDD day numbers (what the rollups, popups and forecasts key on) in int32.
+# Descriptions, images and addresses are read for the rows being shown (see
+# with_details).
+REPORT_DTYPES = {
+    "id": "int64",
+    "lat": COORD_DTYPE,
+    "lon": COORD_DTYPE,
+    "date": "int32",
+    "sightings": "int32",
+}
+
+# Parsed frames keyed by source name -> (signature, DataFrame). Only the latest
+# signature per source is kept, so stale copies are dropped as soon as a file changes.
+_cache = {}
+_lock = threading.Lock()
+
+
+# Identity of a file on disk: changes whenever the file is rewritten or appended to.
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return (os.path.abspath(path), None, None)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _memoized(name, signature, load):
+    with _lock:
+        hit = _cache.get(name)
+        if hit is not None and hit[0] == signature:
+            return hit[1].copy(deep=False)
+    frame = load()
+    with _lock:
+        _cache[name] = (signature, frame)
+    return frame.copy(deep=False)
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+# Reports from the ReportStore, re-read only when the store's write version changes
+# (i.e. right after a new report is added). A columnar snapshot of the current
+# report rows is read instead of querying the store when one exists. The version,
+# data key and rows are all read in one transaction, and the version is attached
+# to the frame (see loaded_version).
+def load_reports(store):
+    def load():
+        columns = list(REPORT_DTYPES)
+        try:
+            df = read_fresh_snapshot("reports", store.data_key("reports"), columns=columns)
+        except ValueError:
+            # Snapshots written before a column was added are ignored
+            df = None
+        if df is None:
+            return store.load(columns, REPORT_DTYPES)
+        return df.astype(REPORT_DTYPES)
+    with store.reading():
+        version = store.version()
+        df = _memoized("reports:" + os.path.abspath(store.path), version, load)
+    df.attrs["version"] = version
+    return df
+
+
+# The version a frame from load_reports (store version) or load_landfills (file
+# signature) was read at. Anything derived from the frame, such as an index whose
+# positions are used with df.iloc, must be keyed on this rather than on a fresh
+# store.version(), which may already be newer.
+def loaded_version(df):
+    return df.attrs["version"]
+
+
+# The given rows of a report frame with their description, image and address
+# added, read from the store in one query.
+def with_details(store, df):
+    details = store.details(df["id"])
+    return df.join(details.astype({c: "string" for c in details.columns}), on="id")
+
+
+# Landfill sites with just the columns the maps need out of the 48-column file.
+def load_landfills(path):
+    def load():
+        if not os.path.exists(path):
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in LANDFILL_DTYPES.items()})
+        df = read_fresh_snapshot("landfills", signature, columns=LANDFILL_COLUMNS)
+        if df is None:
+            df = pd.read_csv(path, usecols=LANDFILL_COLUMNS)
+        df = df[LANDFILL_COLUMNS].astype(LANDFILL_DTYPES)
+        return df.dropna(subset=["LATITUDE", "LONGITUDE"]).reset_index(drop=True)
+    signature = file_signature(path)
+    df = _memoized("landfills:" + os.path.abspath(path), signature, load)
+    df.attrs["version"] = signature
+    return df
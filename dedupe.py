@@ -0,0 +1,82 @@
+import math
+import threading
+from datetime import datetime, timedelta
+
+from spatial_index import haversine, EARTH_RADIUS_KM
+
+# A new report within this distance of one from the last DUPLICATE_WINDOW_DAYS is a
+# repeat sighting of the same pile.
+DUPLICATE_RADIUS_M = 30
+DUPLICATE_WINDOW_DAYS = 7
+# When both reports have photos, the photos decide instead, within this wider
+# radius (phone GPS is often off by tens of metres).
+IMAGE_MATCH_RADIUS_M = 100
+# Largest Hamming distance between two 64-bit image hashes that counts as the same pile.
+IMAGE_HASH_MAX_DISTANCE = 10
+
+# Serializes the look-up-then-insert of concurrent submissions in this process.
+_submit_lock = threading.Lock()
+
+
+# 64-bit difference hash of an image (path or file object) as 16 hex digits, or
+# None if the image cannot be read. Robust to resizing and recompression.
+def image_hash(source):
+    from PIL import Image, ImageOps
+    try:
+        with Image.open(source) as img:
+            small = ImageOps.exif_transpose(img).convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+            pixels = list(small.getdata())
+    except OSError:
+        return None
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def hash_distance(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def _shift_date(date, days):
+    return int((datetime.strptime(str(date), "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d"))
+
+
+# The stored report a new submission duplicates, as a dict with its id, image and
+# distance in metres, or None.
+def find_duplicate(store, lat, lon, date, new_hash=None):
+    dlat = math.degrees(IMAGE_MATCH_RADIUS_M / 1000 / EARTH_RADIUS_KM)
+    dlon = dlat / max(math.cos(math.radians(lat)), 0.01)
+    rows = store.connection().execute(
+        "SELECT id, lat, lon, image, image_hash FROM reports "
+        "WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ? AND COALESCE(last_seen, date) >= ? AND date <= ?",
+        (lat - dlat, lat + dlat, lon - dlon, lon + dlon,
+         _shift_date(date, -DUPLICATE_WINDOW_DAYS), _shift_date(date, DUPLICATE_WINDOW_DAYS)),
+    ).fetchall()
+    best = None
+    for report_id, r_lat, r_lon, image, stored_hash in rows:
+        distance = float(haversine(lat, lon, r_lat, r_lon)) * EARTH_RADIUS_KM * 1000
+        if new_hash and stored_hash:
+            same = distance <= IMAGE_MATCH_RADIUS_M and hash_distance(new_hash, stored_hash) <= IMAGE_HASH_MAX_DISTANCE
+        else:
+            same = distance <= DUPLICATE_RADIUS_M
+        if same and (best is None or distance < best["distance_m"]):
+            best = {"id": report_id, "image": image or "", "distance_m": distance}
+    return best
+
+
+# Store a submitted report, or merge it into the report it duplicates. save_image()
+# writes the uploaded photo and returns its path; it is only called when the photo
+# will be kept. Returns (report_id, sightings), sightings being 1 for a new report.
+def submit_report(store, lat, lon, date, description, new_hash=None, save_image=None):
+    with _submit_lock:
+        duplicate = find_duplicate(store, lat, lon, date, new_hash)
+        if duplicate is not None:
+            image = save_image() if save_image and not duplicate["image"] else ""
+            return duplicate["id"], store.add_sighting(duplicate["id"], date, image, new_hash)
+        image = save_image() if save_image else ""
+        return store.add(lat, lon, date, description, image, new_hash), 1
@@ -0,0 +1,73 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+from spatial_index import haversine, EARTH_RADIUS_KM
+
+FEED_PAGE_SIZE = 20
+# Columns the Community event cards are rendered from.
+FEED_COLUMNS = ["id", "date", "time", "lat", "lon", "description", "access_features", "special_requirements",
+                "address"]
+# Half-width of the first box searched around the user; it grows 4x until it
+# holds the requested page.
+FEED_START_RADIUS_KM = 10.0
+
+
+def _frame(rows):
+    return pd.DataFrame.from_records(rows, columns=FEED_COLUMNS)
+
+
+# One page of events, newest first, and whether another page follows. `after` is
+# the feed_key of the previous page's last event (None for the first page); the
+# (date, time, id) index, walked backwards, makes every page one short range scan.
+def events_by_date(store, limit=FEED_PAGE_SIZE, after=None):
+    query = f"SELECT {', '.join(FEED_COLUMNS)} FROM events"
+    params = []
+    if after is not None:
+        query += " WHERE (date, time, id) < (?, ?, ?)"
+        params += list(after)
+    rows = store.connection().execute(query + " ORDER BY date DESC, time DESC, id DESC LIMIT ?",
+                                      params + [limit + 1]).fetchall()
+    return _frame(rows[:limit]), len(rows) > limit
+
+
+# Key of an event row to continue events_by_date after it.
+def feed_key(row):
+    return row["date"], row["time"], int(row["id"])
+
+
+# Events offset .. offset + limit - 1 by distance from (lat, lon), with a
+# distance_km column, and whether another page follows. Only the events inside a
+# lat/lon box around the user are read; the box grows until the nearest events it
+# holds are known to be nearer than anything outside it.
+def events_by_distance(store, lat, lon, limit=FEED_PAGE_SIZE, offset=0):
+    conn = store.connection()
+    needed = offset + limit + 1
+    radius_km = FEED_START_RADIUS_KM
+    while True:
+        everything = radius_km >= math.pi * EARTH_RADIUS_KM
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        dlon = dlat / max(math.cos(math.radians(min(abs(lat) + dlat, 90.0))), 1e-6)
+        query, params = "SELECT id, lat, lon FROM events WHERE lat BETWEEN ? AND ?", [lat - dlat, lat + dlat]
+        if everything:
+            query, params = "SELECT id, lat, lon FROM events", []
+        elif -180.0 <= lon - dlon and lon + dlon <= 180.0:
+            query += " AND lon BETWEEN ? AND ?"
+            params += [lon - dlon, lon + dlon]
+        found = np.array(conn.execute(query, params).fetchall(), dtype=np.float64).reshape(-1, 3)
+        distances = haversine(lat, lon, found[:, 1], found[:, 2]) * EARTH_RADIUS_KM
+        order = np.argsort(distances, kind="stable")
+        # Everything within radius_km of the user is inside the box
+        if everything or (order.size >= needed and distances[order[needed - 1]] <= radius_km):
+            break
+        radius_km *= 4
+    page = order[offset:offset + limit]
+    ids = found[page, 0].astype(np.int64)
+    rows = conn.execute(
+        f"SELECT {', '.join(FEED_COLUMNS)} FROM events WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids.tolist()),),
+    ).fetchall()
+    df = _frame(rows).set_index("id").reindex(ids).reset_index()
+    return df.assign(distance_km=distances[page]), order.size > offset + limit
@@ -0,0 +1,235 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import brier_score_loss
+
+FORECAST_MODEL_PATH = os.path.join("models", "hotspot_forecast.joblib")
+POLLUTION_DATA_FILE = "pollution_data.csv"
+# Forecast grid cell size in degrees (~1 km).
+FORECAST_CELL_DEG = 0.01
+# Trailing windows (in weeks) of report counts used as features.
+FORECAST_WINDOWS = (1, 4, 12)
+# Cap on "weeks since the last report" so long-quiet cells share one value.
+_QUIET_WEEKS_CAP = 52
+POLLUTION_COLUMNS = ["pollution_level", "industrial_density", "traffic"]
+FEATURES = ([f"reports_{w}w" for w in FORECAST_WINDOWS]
+            + ["neighbor_reports_4w", "weeks_since_report"] + POLLUTION_COLUMNS)
+# Monday used as week 0, so week numbers line up with the weekly rollups.
+_EPOCH = pd.Timestamp("2000-01-03")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecast_cells (
+    cell_lat REAL NOT NULL,
+    cell_lon REAL NOT NULL,
+    risk REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_forecast_cells_lat_lon ON forecast_cells (cell_lat, cell_lon);
+"""
+
+
+# Integer (row, col) of the forecast cell containing each point.
+def _cells(lats, lons, cell_deg):
+    return (np.floor((np.asarray(lats) + 90.0) / cell_deg).astype(np.int64),
+            np.floor((np.asarray(lons) + 180.0) / cell_deg).astype(np.int64))
+
+
+# Report history binned into a dense (cell x week) count matrix.
+class CellHistory:
+    def __init__(self, reports, cell_deg=FORECAST_CELL_DEG):
+        self.cell_deg = cell_deg
+        dates = pd.to_datetime(reports["date"].astype(str), format="%Y%m%d", errors="coerce")
+        ok = dates.notna().to_numpy()
+        rows, cols = _cells(reports["lat"].to_numpy()[ok], reports["lon"].to_numpy()[ok], cell_deg)
+        weeks = ((dates[ok] - _EPOCH).dt.days // 7).to_numpy()
+        self.n_cols = int(np.ceil(360.0 / cell_deg)) + 1
+        self.keys, cell_idx = np.unique(rows * self.n_cols + cols, return_inverse=True)
+        self.first_week = int(weeks.min()) if weeks.size else 0
+        n_weeks = int(weeks.max()) - self.first_week + 1 if weeks.size else 0
+        self.counts = np.zeros((self.keys.size, n_weeks), dtype=np.int32)
+        np.add.at(self.counts, (cell_idx, weeks - self.first_week), 1)
+        # Cumulative counts (after a zero column) and, for every week, the last week
+        # up to it with a report; built once so each week's features are O(cells).
+        self.cum = np.concatenate([np.zeros((self.keys.size, 1), np.int64), np.cumsum(self.counts, axis=1)], axis=1)
+        self.last = np.maximum.accumulate(
+            np.where(self.counts > 0, np.arange(n_weeks), -_QUIET_WEEKS_CAP), axis=1)
+
+    @property
+    def n_weeks(self):
+        return self.counts.shape[1]
+
+    # Centre (lat, lon) of every cell.
+    def centers(self):
+        lats = (self.keys // self.n_cols + 0.5) * self.cell_deg - 90.0
+        lons = (self.keys % self.n_cols + 0.5) * self.cell_deg - 180.0
+        return lats, lons
+
+    # Mean pollution covariates per cell from point observations, NaN where a cell
+    # has none (the model handles missing values natively). A covariate observed in
+    # no cell at all is zeroed, since the model cannot bin an all-missing column.
+    def covariates(self, pollution):
+        out = np.full((self.keys.size, len(POLLUTION_COLUMNS)), np.nan)
+        if pollution is None or pollution.empty:
+            return np.zeros_like(out)
+        rows, cols = _cells(pollution["latitude"], pollution["longitude"], self.cell_deg)
+        means = pollution[POLLUTION_COLUMNS].groupby(rows * self.n_cols + cols).mean()
+        pos = np.searchsorted(self.keys, means.index.to_numpy())
+        hit = (pos < self.keys.size) & (self.keys[np.minimum(pos, self.keys.size - 1)] == means.index.to_numpy())
+        out[pos[hit]] = means.to_numpy()[hit]
+        out[:, np.isnan(out).all(axis=0)] = 0.0
+        return out
+
+    # Index of the neighbouring cell at (drow, dcol) for every cell, -1 if empty.
+    def _neighbor(self, drow, dcol):
+        target = self.keys + drow * self.n_cols + dcol
+        pos = np.minimum(np.searchsorted(self.keys, target), self.keys.size - 1)
+        return np.where(self.keys[pos] == target, pos, -1)
+
+    # Feature matrix describing every cell as of the end of `week` (an index into
+    # the history), using only data up to and including that week.
+    def features(self, week, covariates):
+        return self._features(np.array([week]), covariates)
+
+    # Features of every cell at each of the given weeks, stacked week by week. The
+    # windows are differences of the cumulative counts, taken for all weeks at once.
+    def _features(self, weeks, covariates):
+        end = weeks + 1
+
+        def window(w):
+            return self.cum[:, end] - self.cum[:, np.maximum(end - w, 0)]
+
+        recent = window(4)
+        neighbor = np.zeros_like(recent)
+        for drow in (-1, 0, 1):
+            for dcol in (-1, 0, 1):
+                if drow or dcol:
+                    idx = self._neighbor(drow, dcol)
+                    neighbor += np.where((idx >= 0)[:, None], recent[np.maximum(idx, 0)], 0)
+        quiet = np.minimum(weeks - self.last[:, weeks], _QUIET_WEEKS_CAP)
+        # (cell x week) matrices to one row per (week, cell)
+        columns = [m.T.ravel() for m in [window(w) for w in FORECAST_WINDOWS] + [neighbor, quiet]]
+        return np.column_stack(columns + [np.tile(covariates, (weeks.size, 1))]).astype(np.float64)
+
+    # Stacked (features, target) pairs: each cell at each week, labelled with
+    # whether it got at least one report the following week.
+    def training_set(self, covariates, weeks):
+        weeks = np.asarray(weeks, dtype=np.int64)
+        y = (self.counts[:, weeks + 1] > 0).T.ravel()
+        return self._features(weeks, covariates), y.astype(np.int8)
+
+
+def load_pollution(path=POLLUTION_DATA_FILE):
+    if not os.path.exists(path):
+        return None
+    return pd.read_csv(path, usecols=["latitude", "longitude"] + POLLUTION_COLUMNS, skipinitialspace=True)
+
+
+# Fit the next-week hotspot model on the full report history. With too little
+# history for a classifier (fewer than two weeks, or only one outcome), the saved
+# model is None and predictions fall back to the recent report rate.
+def train(reports, pollution=None, cell_deg=FORECAST_CELL_DEG):
+    history = CellHistory(reports, cell_deg)
+    covariates = history.covariates(pollution)
+    model, metrics = None, {}
+    if history.n_weeks >= 2:
+        X, y = history.training_set(covariates, range(history.n_weeks - 1))
+        if np.unique(y).size == 2:
+            # Score on the last week before refitting on everything
+            n_last = history.keys.size
+            if history.n_weeks >= 3 and np.unique(y[:-n_last]).size == 2:
+                held_out = HistGradientBoostingClassifier(max_iter=200).fit(X[:-n_last], y[:-n_last])
+                metrics["brier_last_week"] = float(brier_score_loss(y[-n_last:], held_out.predict_proba(X[-n_last:])[:, 1]))
+            model = HistGradientBoostingClassifier(max_iter=200).fit(X, y)
+    return {
+        "model": model,
+        "features": FEATURES,
+        "cell_deg": cell_deg,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "metrics": metrics,
+    }
+
+
+def save_model(artifact, path=FORECAST_MODEL_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    joblib.dump(artifact, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def load_model(path=FORECAST_MODEL_PATH):
+    return joblib.load(path) if os.path.exists(path) else None
+
+
+# Probability of at least one report next week for every cell with history, as a
+# DataFrame of cell centres and risk.
+def predict(artifact, reports, pollution=None):
+    history = CellHistory(reports, artifact["cell_deg"])
+    lats, lons = history.centers()
+    if history.n_weeks == 0:
+        return pd.DataFrame({"cell_lat": lats, "cell_lon": lons, "risk": np.zeros(0)})
+    X = history.features(history.n_weeks - 1, history.covariates(pollution))
+    if artifact["model"] is not None:
+        risk = artifact["model"].predict_proba(X)[:, 1]
+    else:
+        # Poisson chance of a report at the trailing 4-week rate
+        risk = 1.0 - np.exp(-X[:, FEATURES.index("reports_4w")] / 4.0)
+    return pd.DataFrame({"cell_lat": lats, "cell_lon": lons, "risk": risk})
+
+
+# Replace the served per-cell predictions in the report store.
+def publish(store, predictions, artifact):
+    with store.connection() as conn:
+        conn.executescript(_SCHEMA)
+        conn.execute("DELETE FROM forecast_cells")
+        conn.executemany("INSERT INTO forecast_cells (cell_lat, cell_lon, risk) VALUES (?, ?, ?)",
+                         predictions[["cell_lat", "cell_lon", "risk"]].itertuples(index=False, name=None))
+    store.set_meta("forecast:trained_at", artifact["trained_at"])
+    store.set_meta("forecast:cell_deg", artifact["cell_deg"])
+    store.set_meta("forecast:source_version", store.version())
+
+
+# Published predictions inside bounds (lat_min, lat_max, lon_min, lon_max), riskiest
+# first. Only reads the table written by the batch job; nothing is predicted here.
+def forecast_cells(store, bounds, min_risk=0.0, limit=500):
+    conn = store.connection()
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'forecast_cells'").fetchone():
+        return pd.DataFrame(columns=["cell_lat", "cell_lon", "risk"])
+    lat_min, lat_max, lon_min, lon_max = bounds
+    lon_op = "AND" if lon_min <= lon_max else "OR"
+    return pd.read_sql_query(
+        f"SELECT cell_lat, cell_lon, risk FROM forecast_cells WHERE cell_lat BETWEEN ? AND ? "
+        f"AND (cell_lon >= ? {lon_op} cell_lon <= ?) AND risk >= ? ORDER BY risk DESC LIMIT ?",
+        conn, params=(lat_min, lat_max, lon_min, lon_max, min_risk, limit),
+    )
+
+
+if __name__ == "__main__":
+    from report_store import ReportStore, REPORTS_DB
+    parser = argparse.ArgumentParser(description="Train the hotspot forecast and publish per-cell risk.")
+    parser.add_argument("command", choices=["train", "predict"],
+                        help="train: fit, save and publish; predict: re-score with the saved model")
+    parser.add_argument("--db", default=REPORTS_DB)
+    parser.add_argument("--pollution", default=POLLUTION_DATA_FILE)
+    parser.add_argument("--model", default=FORECAST_MODEL_PATH)
+    args = parser.parse_args()
+    store = ReportStore(args.db)
+    reports = store.load()
+    pollution = load_pollution(args.pollution)
+    start = time.perf_counter()
+    if args.command == "train":
+        artifact = train(reports, pollution)
+        save_model(artifact, args.model)
+        kind = "baseline (not enough history)" if artifact["model"] is None else "gradient boosting"
+        print(f"trained {kind} model -> {args.model} {artifact['metrics']}")
+    else:
+        artifact = load_model(args.model)
+        if artifact is None:
+            parser.error(f"no model at {args.model}; run train first")
+    predictions = predict(artifact, reports, pollution)
+    publish(store, predictions, artifact)
+    print(f"published {len(predictions):,} cells in {time.perf_counter() - start:.2f} s")
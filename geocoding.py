@@ -0,0 +1,208 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+GEOCODE_CACHE_DB = "geocode_cache.db"
+# Coordinates are rounded to this many decimals (~11 m) before lookup, so nearby
+# reports of the same spot share one cached address.
+GEOCODE_PRECISION = 4
+# Nominatim's usage policy allows at most one request per second.
+GEOCODE_MIN_DELAY = 1.0
+GEOCODE_MAX_WORKERS = 2
+
+ADDRESS_NOT_FOUND = "Address not found"
+ADDRESS_ERROR = "Error fetching address"
+
+
+# Reverse geocoding through OpenStreetMap Nominatim; one client reused for all calls.
+class NominatimBackend:
+    def __init__(self, user_agent="waste_app"):
+        from geopy.geocoders import Nominatim
+        self.client = Nominatim(user_agent=user_agent)
+
+    def reverse(self, lat, lon):
+        location = self.client.reverse((lat, lon), language="en")
+        return location.address if location else None
+
+
+# Offline backend for tests and local runs: looks addresses up in a dict keyed on
+# rounded (lat, lon), or formats the coordinates when no entry exists.
+class StubBackend:
+    def __init__(self, addresses=None):
+        self.addresses = addresses or {}
+        self.calls = 0
+
+    def reverse(self, lat, lon):
+        self.calls += 1
+        return self.addresses.get((lat, lon), f"{lat:.4f}, {lon:.4f}")
+
+
+# Persistent reverse-geocoding cache in front of a pluggable backend. Lookups are
+# keyed on rounded coordinates and survive restarts; misses are resolved through a
+# small worker pool that shares one rate limiter.
+class Geocoder:
+    def __init__(self, backend=None, cache_path=GEOCODE_CACHE_DB, precision=GEOCODE_PRECISION,
+                 min_delay=GEOCODE_MIN_DELAY, max_workers=GEOCODE_MAX_WORKERS):
+        self.backend = backend if backend is not None else NominatimBackend()
+        self.cache_path = cache_path
+        self.precision = precision
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self._local = threading.local()
+        self._rate_lock = threading.Lock()
+        self._last_request = 0.0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "lat REAL NOT NULL, lon REAL NOT NULL, address TEXT NOT NULL, "
+                "PRIMARY KEY (lat, lon))"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def key(self, lat, lon):
+        return (round(float(lat), self.precision), round(float(lon), self.precision))
+
+    def cached(self, keys):
+        keys = list(set(keys))
+        found = {}
+        conn = self._connect()
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(keys), 400):
+            chunk = keys[start:start + 400]
+            where = " OR ".join(["(lat = ? AND lon = ?)"] * len(chunk))
+            params = [v for k in chunk for v in k]
+            for lat, lon, address in conn.execute(f"SELECT lat, lon, address FROM geocode WHERE {where}", params):
+                found[(lat, lon)] = address
+        return found
+
+    def _store(self, results):
+        if not results:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO geocode (lat, lon, address) VALUES (?, ?, ?)",
+                [(lat, lon, address) for (lat, lon), address in results.items()],
+            )
+
+    def _wait_turn(self):
+        with self._rate_lock:
+            wait = self._last_request + self.min_delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_request = time.monotonic()
+
+    def _resolve(self, key):
+        self._wait_turn()
+        try:
+            return self.backend.reverse(*key) or ADDRESS_NOT_FOUND, True
+        except Exception:
+            # Transient failures are not cached so the lookup is retried next time.
+            return ADDRESS_ERROR, False
+
+    # Resolve many coordinates at once. Returns a list of addresses in input order;
+    # each distinct rounded coordinate hits the backend at most once.
+    def addresses(self, coords):
+        keys = [self.key(lat, lon) for lat, lon in coords]
+        found = self.cached(keys)
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing:
+            workers = max(1, min(self.max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                resolved = dict(zip(missing, pool.map(self._resolve, missing)))
+            self._store({k: address for k, (address, ok) in resolved.items() if ok})
+            found.update({k: address for k, (address, _) in resolved.items()})
+        return [found[k] for k in keys]
+
+    def address(self, lat, lon):
+        return self.addresses([(lat, lon)])[0]
+
+    # Cached address for a coordinate, or None without touching the backend.
+    def cached_address(self, lat, lon):
+        key = self.key(lat, lon)
+        return self.cached([key]).get(key)
+
+
+# Background ingest-time geocoding. Submit paths enqueue (table, row_id, lat, lon)
+# and a single daemon thread resolves them in batches and writes the addresses into
+# the stored records, so read pages only ever display precomputed addresses.
+class GeocodeQueue:
+    def __init__(self, geocoder, store, batch_size=50):
+        self.geocoder = geocoder
+        self.store = store
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._missing_version = None
+
+    def submit(self, table, row_id, lat, lon):
+        with self._lock:
+            if (table, row_id) in self._pending:
+                return
+            self._pending.add((table, row_id))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="geocode-queue", daemon=True)
+                self._thread.start()
+        self._queue.put((table, row_id, lat, lon))
+
+    # Resolve a coordinate that has no stored record (e.g. a cluster centroid) into
+    # the geocode cache only, so a later Geocoder.cached_address call finds it.
+    def prefetch(self, lat, lon):
+        self.submit(None, self.geocoder.key(lat, lon), lat, lon)
+
+    # Enqueue every stored row that has no address yet (e.g. rows imported from CSV).
+    def submit_missing(self, tables):
+        for table in tables:
+            for row_id, lat, lon in self.store.missing_addresses(table):
+                self.submit(table, row_id, lat, lon)
+
+    # submit_missing at most once per store version.
+    def submit_missing_for(self, tables, version):
+        with self._lock:
+            if version == self._missing_version:
+                return
+            self._missing_version = version
+        self.submit_missing(tables)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                resolved = self.geocoder.addresses([(lat, lon) for _, _, lat, lon in batch])
+                by_table = {}
+                for (table, row_id, _, _), address in zip(batch, resolved):
+                    if table is not None and address != ADDRESS_ERROR:
+                        by_table.setdefault(table, {})[row_id] = address
+                for table, addresses in by_table.items():
+                    self.store.set_addresses(table, addresses)
+            except Exception:
+                # Leave the rows without an address; they are queued again once the
+                # store version changes (see submit_missing_for).
+                pass
+            finally:
+                with self._lock:
+                    for table, row_id, _, _ in batch:
+                        self._pending.discard((table, row_id))
@@ -0,0 +1,4 @@
+# Page handlers and shared services of the GreenSight Streamlit app. Each page is a
+# module under greensight.views that is only imported when it is shown, so heavy
+# dependencies (sklearn, folium, fpdf, pyarrow, ...) load on first use instead of
+# on every cold start.
@@ -0,0 +1,8 @@
+DATA_FILE = "waste_reports.csv"
+LANDFILL_DATA_FILE = "large_landfills.csv"
+EVENTS_FILE = "cleanup_events.csv"
+DEFAULT_CENTER = [43.6532, -79.3832]
+DEFAULT_ZOOM = 12
+ADDRESS_PENDING = "Address pending..."
+# How long a page waits for a hotspot update before rendering with the stored labels.
+HOTSPOT_WAIT_SECONDS = 2.0
@@ -0,0 +1,126 @@
+import streamlit as st
+
+from greensight.config import DATA_FILE, EVENTS_FILE, HOTSPOT_WAIT_SECONDS
+
+# Process-wide services shared by every session. Each getter imports what it needs
+# when first called, so a page only pays for the services it actually uses.
+
+
+# Shared report store; the legacy CSV is imported into it once on first start.
+@st.cache_resource
+def get_report_store():
+    from report_store import ReportStore, REPORTS_DB
+    from rollups import ensure_rollups
+    store = ReportStore(REPORTS_DB)
+    # Events first: their signed positions help place the legacy reports
+    store.import_events_csv(EVENTS_FILE)
+    store.import_csv(DATA_FILE)
+    ensure_rollups(store)
+    return store
+
+
+# Shared reverse geocoder with a persistent on-disk cache of resolved addresses.
+@st.cache_resource
+def get_geocoder():
+    from geocoding import Geocoder, GEOCODE_CACHE_DB
+    return Geocoder(cache_path=GEOCODE_CACHE_DB)
+
+
+# Background queue that geocodes new reports and events after they are saved.
+# Rows stored without an address are queued once per store version: rows imported
+# from CSV on startup, rows written by other processes (the ingest CLI and
+# endpoint) when the app next sees them, and failed lookups after the next write.
+def get_geocode_queue():
+    from report_store import ADDRESS_TABLES
+    geocode_queue = _geocode_queue()
+    geocode_queue.submit_missing_for(ADDRESS_TABLES, get_report_store().version())
+    return geocode_queue
+
+
+@st.cache_resource
+def _geocode_queue():
+    from geocoding import GeocodeQueue
+    return GeocodeQueue(get_geocoder(), get_report_store())
+
+
+# DBSCAN hotspot labels persisted in the report store and updated incrementally
+@st.cache_resource
+def get_hotspot_engine():
+    from hotspots import HotspotEngine
+    return HotspotEngine(get_report_store())
+
+
+# Multi-resolution report density grid for the View Analysis heatmap
+@st.cache_resource
+def get_density_grid():
+    from heatmap import DensityGrid
+    return DensityGrid()
+
+
+# Background jobs (hotspot updates, PDF exports) shared by all sessions; pages
+# submit work here and poll it instead of running it inside the script body.
+@st.cache_resource
+def get_job_runner():
+    from jobs import JobRunner
+    return JobRunner()
+
+
+# Derived artifacts shared across sessions, keyed on the report store version.
+@st.cache_resource
+def get_artifact_cache():
+    from artifact_cache import ArtifactCache
+    return ArtifactCache()
+
+
+# Grid indexes over the positions in the given report and landfill frames, cached
+# on the versions they were loaded at, so index positions always match the
+# caller's frames (the frames themselves are not hashed).
+def get_map_index(reports, landfills):
+    from data_loader import loaded_version
+    return _map_index(loaded_version(reports), loaded_version(landfills), reports, landfills)
+
+
+@st.cache_resource(max_entries=1)
+def _map_index(report_version, landfill_signature, _reports, _landfills):
+    from viewport import MapIndex
+    return MapIndex(_reports["lat"], _reports["lon"], _landfills["LATITUDE"], _landfills["LONGITUDE"])
+
+
+# Nearest-dump index over the given reports and landfill sites, rebuilt only when
+# their versions change.
+def get_dump_finder(reports, landfills):
+    from data_loader import loaded_version
+    return _dump_finder(loaded_version(reports), loaded_version(landfills), reports, landfills)
+
+
+@st.cache_resource(max_entries=1)
+def _dump_finder(report_version, landfill_signature, _reports, _landfills):
+    from nearest_dumps import DumpFinder
+    store = get_report_store()
+    return DumpFinder(_reports, _landfills,
+                      describe=lambda ids: store.details(ids, ["description"])["description"])
+
+
+# Hotspot label per report in df and the per-cluster summary (centroid, count,
+# radius, bounds). The update runs on the job runner; incremental updates normally
+# finish within the wait, and both are then computed once per version for all
+# sessions. A long recompute keeps running while the page shows the labels stored
+# so far. Results are cached on the version df was loaded at, so they always
+# line up with df row for row.
+def hotspots_for(df):
+    from data_loader import loaded_version
+    from hotspots import cluster_summary
+    from jobs import FAILED
+    engine, cache = get_hotspot_engine(), get_artifact_cache()
+    version = loaded_version(df)
+    job = get_job_runner().submit(("hotspots", version), engine.update, label="Updating hotspots")
+    if not job.wait(HOTSPOT_WAIT_SECONDS):
+        st.caption("Hotspots are being updated in the background; refresh to see the latest clusters.")
+        labels = engine.labels(df["id"])
+        return labels, cluster_summary(df["lat"], df["lon"], labels)
+    if job.status == FAILED:
+        st.warning(f"Hotspot update failed: {job.error}")
+    labels = cache.get_or_compute("hotspot_labels", version, lambda: engine.labels(df["id"]))
+    summary = cache.get_or_compute("hotspot_summary", version,
+                                   lambda: cluster_summary(df["lat"], df["lon"], labels))
+    return labels, summary
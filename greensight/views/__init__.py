@@ -0,0 +1,16 @@
+import importlib
+
+# Sidebar title -> module under greensight.views with a render() function.
+PAGES = {
+    "Report Incident": "report_incident",
+    "View Analysis": "view_analysis",
+    "Graphic Analysis": "graphic_analysis",
+    "Community": "community",
+    "Organize Cleanup": "organize_cleanup",
+    "Hazardous Waste": "hazardous_waste",
+}
+
+
+# Import the selected page's module on demand and draw it.
+def render(title):
+    importlib.import_module(f"{__name__}.{PAGES[title]}").render()
@@ -0,0 +1,87 @@
+import pandas as pd
+import streamlit as st
+from streamlit_geolocation import streamlit_geolocation
+
+from feed import FEED_PAGE_SIZE, events_by_date, events_by_distance, feed_key
+from greensight import services
+from greensight.config import ADDRESS_PENDING
+
+
+# Emoji for each accessibility feature listed in an event's access_features.
+def access_icons(access_str):
+    icons = []
+    if isinstance(access_str, str):
+        if "wheelchair" in access_str: icons.append("♿")
+        if "interpreter" in access_str: icons.append("👐")
+        if "child_friendly" in access_str: icons.append("🧒")
+        if "senior_transport" in access_str: icons.append("🚌")
+    return " ".join(icons)
+
+
+def event_card(row, address, bg_color):
+    return f"""
+    <div style="background-color:{bg_color}; padding:15px; border-radius:12px; margin-bottom:10px;">
+        <h4>📍 Location: ({address})</h4>
+        <p><strong>🗓 Date:</strong> {row['date']}</p>
+        <p><strong>⏰ Time:</strong> {row['time']}</p>
+        <p><strong>📝 Description:</strong> {row['description']}</p>
+        <p><strong>🏠 Coordinates:</strong> {float(row['lat']):.4f}, {float(row['lon']):.4f}</p>
+        <p><strong>♿️ Accessibility:</strong> {access_icons(row['access_features'])} {row['access_features']}</p>
+        <p><strong>‼️ Special Requirements:</strong> {row['special_requirements']}</p>
+        <a href="https://x.com/intent/tweet?text=Check%20out%20this%20illegal%20waste%20report!%20{row['description']}%20{address}" target="_blank">
+                        <img src="https://upload.wikimedia.org/wikipedia/commons/b/b7/X_logo.jpg" alt="Share on X" width="30" style="margin-right:10px;">
+                    </a>
+                    <a href="https://www.instagram.com/?url=https://example.com/{row['lat']},{row['lon']}" target="_blank">
+                        <img src="https://upload.wikimedia.org/wikipedia/commons/9/95/Instagram_logo_2022.svg" alt="Share on Instagram" width="30" style="margin-right:10px;">
+                    </a>
+                    <a href="https://www.youtube.com/results?search_query={row['description']}" target="_blank">
+                        <img src="https://upload.wikimedia.org/wikipedia/commons/4/42/YouTube_icon_%282013-2017%29.png" alt="Share on YouTube" width="30">
+                    </a>
+    </div>
+    """
+
+
+def render():
+    st.header("🌍 Community Waste Reports")
+    store = services.get_report_store()
+    services.get_geocode_queue()
+
+    user_location = streamlit_geolocation()
+    user_lat = user_location['latitude'] if user_location else None
+    user_lon = user_location['longitude'] if user_location else None
+
+    sort_option = st.selectbox("Sort by:", ["Most Recent", "Closest to Me"])
+    by_distance = sort_option == "Closest to Me" and user_lat is not None and user_lon is not None
+    if sort_option == "Closest to Me" and not by_distance:
+        st.warning("Cannot sort by distance without location access.")
+
+    # Only the current page is queried. Date pages continue from the key of the
+    # previous page's last event; one key is kept per page to go back.
+    state = st.session_state.setdefault("community_feed", {"order": None, "page": 0, "after": [None]})
+    if state["order"] != by_distance:
+        state.update(order=by_distance, page=0, after=[None])
+    page = state["page"]
+    if by_distance:
+        df, has_more = events_by_distance(store, user_lat, user_lon, FEED_PAGE_SIZE, page * FEED_PAGE_SIZE)
+    else:
+        df, has_more = events_by_date(store, FEED_PAGE_SIZE, state["after"][page])
+    if df.empty and page == 0:
+        st.info("No reports submitted yet.")
+        st.stop()
+
+    cards = []
+    for i, row in enumerate(df.to_dict("records")):
+        address = row['address'] if pd.notna(row['address']) else ADDRESS_PENDING
+        cards.append(event_card(row, address, "#f0f8ff" if i % 2 == 0 else "#ffe4e1"))
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+    previous, position, following = st.columns([1, 2, 1])
+    if previous.button("← Previous", disabled=page == 0):
+        state["page"] -= 1
+        st.rerun()
+    position.caption(f"Page {page + 1}")
+    if following.button("Next →", disabled=not has_more):
+        if not by_distance and len(state["after"]) == page + 1:
+            state["after"].append(feed_key(df.iloc[-1]))
+        state["page"] += 1
+        st.rerun()
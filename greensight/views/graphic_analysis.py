@@ -0,0 +1,70 @@
+import os
+
+import streamlit as st
+
+from greensight import services
+from greensight.config import LANDFILL_DATA_FILE
+from rollups import rollup_counts, rollup_regions
+
+ROLLUP_PERIODS = ["day", "week", "month"]
+
+
+def render():
+    st.header("Data Analytics")
+    store = services.get_report_store()
+    artifact_cache = services.get_artifact_cache()
+
+    if store.count() == 0:
+        st.warning("No reports to analyze.")
+        st.stop()
+
+    # Counts come from the rollup table kept current on every insert, not a scan of all reports
+    st.subheader("Reports Over Time")
+    col1, col2 = st.columns(2)
+    period = col1.selectbox("Period", ROLLUP_PERIODS, format_func=str.capitalize)
+    version = store.version()
+    regions = artifact_cache.get_or_compute("rollup_regions", version, lambda: rollup_regions(store))
+    region = col2.selectbox("Region", ["All"] + regions)
+    region = None if region == "All" else region
+    counts = artifact_cache.get_or_compute(("rollup_counts", period, region), version,
+                                           lambda: rollup_counts(store, period, region))
+    st.line_chart(counts)
+
+    st.subheader("Statistical Summary")
+    st.write(counts.describe().to_frame(f"reports per {period}"))
+
+    # PDF export runs on the job runner; one export per data version is shared by
+    # everyone who asks for it, and the finished file is offered for download
+    st.subheader("Export")
+    job_runner = services.get_job_runner()
+    if st.button("export"):
+        from pdf_export import export_reports_pdf
+        job = job_runner.submit(("pdf_export", store.version()), export_reports_pdf, store,
+                                label="PDF export", report_progress=True)
+        st.session_state["pdf_export"] = job.id
+    job = job_runner.get(st.session_state["pdf_export"]) if "pdf_export" in st.session_state else None
+    if job is not None:
+        from jobs import FAILED
+        if not job.finished():
+            st.progress(job.fraction(), text=f"Exporting {job.done_count:,} of {job.total:,} reports...")
+            st.button("Refresh")
+        elif job.status == FAILED:
+            st.error(f"Export failed: {job.error}")
+        else:
+            st.download_button("Download PDF", job.result, file_name="waste_reports.pdf", mime="application/pdf")
+
+    # Compressed columnar copies of the datasets for analysts; the app's loaders also
+    # read these instead of the store/CSV while they are current
+    st.subheader("Columnar Snapshots")
+    from snapshots import SNAPSHOT_FORMATS, write_all
+    snapshot_format = st.selectbox("Snapshot format", list(SNAPSHOT_FORMATS))
+    if st.button("Create snapshots"):
+        st.session_state["snapshots"] = write_all(store, LANDFILL_DATA_FILE, snapshot_format)
+    for path in st.session_state.get("snapshots", []):
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                st.download_button(f"Download {os.path.basename(path)}", f.read(),
+                                   file_name=os.path.basename(path), key=f"download_{path}")
+
+    with st.expander("Shared cache statistics"):
+        st.json(artifact_cache.stats())
@@ -0,0 +1,31 @@
+import streamlit as st
+
+
+def render():
+    st.header("WHMIS Instruction")
+
+    # Display the image
+    st.image("pictogram_names.gif", caption='WHMIS Labels!', use_container_width=True)
+
+    st.markdown("""
+    **WHMIS** stands for **Workplace Hazardous Materials Information System**.  
+    It's a system designed to ensure safe use of hazardous materials in Canadian workplaces.
+
+    The image below shows **WHMIS pictograms**, which are used on labels to indicate the type of hazard a product presents.
+    Learn to recognize these symbols to protect yourself and others from potential harm!
+    """)
+
+    st.markdown("""
+    ### Key WHMIS Symbols Explained:
+    - 🔥 **Flame**: Flammable materials or substances that can ignite easily.
+    - ☣️ **Biohazardous Infectious Materials**: Organisms or toxins that can cause diseases.
+    - ☠️ **Skull and Crossbones**: Toxic materials that may cause immediate and serious health effects or death.
+    - 🧪 **Corrosion**: Materials that can cause skin burns, eye damage, or corrode metals.
+    - ⚠️ **Exclamation Mark**: May cause less serious health effects like skin irritation or dizziness.
+    - 🌱 **Environment**: Harmful to aquatic life (note: not mandatory in Canada but often included).
+    - 💥 **Exploding Bomb**: Explosive or self-reactive substances.
+    - 🔬 **Health Hazard**: Materials that may cause serious long-term health effects like cancer.
+    - 🔄 **Gas Cylinder**: Gases under pressure, which can explode if heated.
+
+    Always read the labels and **follow proper disposal procedures** for hazardous waste to protect yourself and the environment.
+    """)
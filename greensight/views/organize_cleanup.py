@@ -0,0 +1,163 @@
+from datetime import datetime
+
+import folium
+import pandas as pd
+import streamlit as st
+from streamlit_folium import st_folium
+from streamlit_geolocation import streamlit_geolocation
+
+from coordinates import stored_coordinate
+from data_loader import load_landfills, load_reports
+from greensight import services
+from greensight.config import ADDRESS_PENDING, LANDFILL_DATA_FILE
+from map_layers import add_point_layer
+
+# Accessibility checkbox label -> value stored in the event's access_features.
+ACCESS_FEATURES = {
+    "♿ Wheelchair accessible routes": "wheelchair",
+    "👐 Sign language interpreter requested": "interpreter",
+    "🧒 Child-friendly facilities": "child_friendly",
+    "🚌 Senior-friendly transportation available": "senior_transport",
+}
+
+
+# Comma-separated access_features value for the ticked checkbox labels.
+def access_features_value(checked):
+    return ",".join(value for label, value in ACCESS_FEATURES.items() if checked.get(label))
+
+
+# Closest Dump: pick one of the k nearest reports/landfills. Returns the target
+# (lat, lon).
+def closest_dump_target(store):
+    # Get the user's current location
+    location = streamlit_geolocation()
+    if location is None:
+        st.error("Unable to retrieve your geolocation. Please ensure location access is enabled and try again.")
+        st.stop()
+
+    user_lat = location.get('latitude')
+    user_lon = location.get('longitude')
+    if user_lat is None or user_lon is None:
+        st.error("Geolocation data is incomplete. Please check your location settings.")
+        st.stop()
+
+    finder = services.get_dump_finder(load_reports(store), load_landfills(LANDFILL_DATA_FILE))
+    if len(finder) == 0:
+        st.warning("No dumps reported yet.")
+        st.stop()
+    # A slider needs max_value > min_value, so it is skipped when there is one site
+    k = 1
+    if len(finder) > 1:
+        k = st.slider("Number of nearby dumps to show", min_value=1, max_value=min(10, len(finder)), value=1)
+    nearest = finder.nearest(user_lat, user_lon, k=k)
+
+    st.subheader("Closest Dump Location" if k == 1 else f"{k} Closest Dump Locations")
+    st.dataframe(nearest.rename(columns={"name": "description / site"}), hide_index=True)
+    choice = st.selectbox(
+        "Target for the cleanup",
+        nearest.index,
+        format_func=lambda i: f"{nearest.loc[i, 'source']}: {nearest.loc[i, 'name'] or 'no description'}"
+                              f" ({nearest.loc[i, 'distance_km']:.2f} km)",
+    )
+    closest_report = nearest.loc[choice]
+
+    st.write(f"**Latitude:** {closest_report['lat']:.5f}  |  **Longitude:** {closest_report['lon']:.5f}")
+    if pd.notna(closest_report['date']):
+        st.write(f"**Reported on:** {closest_report['date']}")
+    st.write(f"**Distance from you:** {closest_report['distance_km']:.2f} km")
+
+    # Display a map with simple markers (no popups)
+    m = folium.Map(location=[user_lat, user_lon], zoom_start=12)
+    folium.Marker(
+        location=[user_lat, user_lon],
+        icon=folium.Icon(color="blue")
+    ).add_to(m)
+    for i, site in nearest.iterrows():
+        folium.Marker(
+            location=[site['lat'], site['lon']],
+            icon=folium.Icon(color="red" if i == choice else "gray")
+        ).add_to(m)
+    st_folium(m, width=700)
+
+    return stored_coordinate(closest_report['lat']), stored_coordinate(closest_report['lon'])
+
+
+# Biggest Dump: the largest hotspot's centroid. Returns the target (lat, lon).
+def biggest_dump_target(store):
+    st.subheader("Biggest Dump Cluster")
+    df = load_reports(store)
+    if len(df) < 5:
+        st.warning("Not enough reports to identify clusters.")
+        st.stop()
+    labels, clusters = services.hotspots_for(df)
+    if clusters.empty:
+        st.error("No clusters detected in the current data.")
+        st.stop()
+
+    # The summary is sorted by size, so the first row is the biggest cluster
+    biggest = clusters.iloc[0]
+    biggest_cluster_label = clusters.index[0]
+    cluster_points = df.loc[labels == biggest_cluster_label, ["lat", "lon"]]
+    centroid_lat = float(biggest["lat"])
+    centroid_lon = float(biggest["lon"])
+
+    st.write(f"**Cluster Label:** {biggest_cluster_label}")
+    st.write(f"**Number of Reports:** {int(biggest['count'])}")
+    st.write(f"**Centroid Location:** {centroid_lat:.5f}, {centroid_lon:.5f}")
+    st.write(f"**Cluster Radius:** {biggest['max_radius_km']:.2f} km")
+
+    m = folium.Map(location=[centroid_lat, centroid_lon], zoom_start=12)
+    add_point_layer(m, cluster_points["lat"], cluster_points["lon"], "blue", radius=3, zoom=12)
+    folium.Marker(
+        location=[centroid_lat, centroid_lon],
+        icon=folium.Icon(color="green")
+    ).add_to(m)
+    if biggest["max_radius_km"] > 0:
+        m.fit_bounds([[biggest["lat_min"], biggest["lon_min"]], [biggest["lat_max"], biggest["lon_max"]]])
+    st_folium(m, width=700)
+
+    # Never block on the geocoder here: show the cached address or queue a lookup
+    address = services.get_geocoder().cached_address(centroid_lat, centroid_lon)
+    if address is None:
+        services.get_geocode_queue().prefetch(centroid_lat, centroid_lon)
+        address = ADDRESS_PENDING
+    st.write(f"**Cluster Address (Centroid):** {address}")
+
+    return stored_coordinate(centroid_lat), stored_coordinate(centroid_lon)
+
+
+def render():
+    st.header("Organize Cleanup Event")
+    store = services.get_report_store()
+    target_option = st.radio("Select target location", ("Closest Dump", "Biggest Dump"))
+    st.write("Please share your location")
+
+    if target_option == "Closest Dump":
+        target_lat, target_lon = closest_dump_target(store)
+    else:
+        target_lat, target_lon = biggest_dump_target(store)
+
+    # Section to schedule the cleanup event
+    st.subheader("Schedule Cleanup Event")
+    event_date = st.date_input("Select cleanup event date", datetime.now())
+    event_time = st.time_input("Select cleanup event time", datetime.now().time())
+    event_description = st.text_area("Event Description (optional)", placeholder="Describe the cleanup event...")
+
+    st.subheader("Accessibility Features")
+    col1, col2 = st.columns(2)
+    labels = list(ACCESS_FEATURES)
+    checked = {}
+    with col1:
+        for label in labels[:2]:
+            checked[label] = st.checkbox(label)
+    with col2:
+        for label in labels[2:]:
+            checked[label] = st.checkbox(label)
+
+    other_needs = st.text_input("Special requirements (e.g., religious accommodations, dietary needs)")
+
+    if st.button("Organize Cleanup Event"):
+        event_id = store.add_event(event_date, event_time, target_lat, target_lon, event_description,
+                                   access_features_value(checked), other_needs)
+        services.get_geocode_queue().submit("events", event_id, target_lat, target_lon)
+        st.success("Cleanup event organized successfully!")
@@ -0,0 +1,84 @@
+import hashlib
+import os
+from datetime import datetime
+
+import folium
+import streamlit as st
+from streamlit_folium import st_folium
+from streamlit_geolocation import streamlit_geolocation
+
+from data_loader import load_landfills, load_reports, with_details
+from dedupe import image_hash, submit_report
+from greensight import services
+from greensight.config import DEFAULT_CENTER, DEFAULT_ZOOM, LANDFILL_DATA_FILE
+from map_layers import add_point_layer, aggregates, generate_popups
+from thumbnails import make_thumbnail
+from viewport import viewport_from_state
+
+
+# Where an uploaded report photo is saved: named by content hash, as ingest names
+# partner photos, so reports at the same spot never share (and overwrite) a file.
+def image_path_for(data):
+    return f"images/{hashlib.sha256(data).hexdigest()[:32]}.jpg"
+
+
+def render():
+    st.header("Report Illegal Waste Location")
+    store = services.get_report_store()
+    geocode_queue = services.get_geocode_queue()
+    date = datetime.now().strftime("%Y%m%d")
+
+    location = streamlit_geolocation()
+    if (location and 'latitude' in location and 'longitude' in location and
+            location['latitude'] is not None and location['longitude'] is not None):
+        current_lat = location['latitude']
+        current_lon = location['longitude']
+    else:
+        current_lat, current_lon = DEFAULT_CENTER
+
+    with st.form("report_form"):
+        # Signed degrees, as the browser reports them (west of Greenwich is negative)
+        lat = st.number_input("Latitude", min_value=-90.0, max_value=90.0, value=float(current_lat), format="%.6f")
+        lon = st.number_input("Longitude", min_value=-180.0, max_value=180.0, value=float(current_lon),
+                              format="%.6f")
+        description = st.text_input("Description of Waste")
+        image_file = st.file_uploader("Upload Image", type=["jpg", "jpeg", "png"])
+        submitted = st.form_submit_button("Submit Report")
+
+        if submitted:
+            def save_image():
+                os.makedirs("images", exist_ok=True)
+                data = image_file.getvalue()
+                image_path = image_path_for(data)
+                with open(image_path, "wb") as f:
+                    f.write(data)
+                try:
+                    make_thumbnail(image_path)
+                except OSError:
+                    st.warning("Could not read the uploaded image; it will be shown without a preview.")
+                return image_path
+
+            # Repeat reports of the same pile (nearby, recent, similar photo) are merged
+            new_hash = image_hash(image_file) if image_file else None
+            report_id, sightings = submit_report(store, lat, lon, date, description, new_hash,
+                                                 save_image if image_file else None)
+            if sightings == 1:
+                geocode_queue.submit("reports", report_id, lat, lon)
+                st.success("Report submitted!")
+            else:
+                st.success(f"This spot was already reported; your report was added as a sighting "
+                           f"(seen {sightings} times).")
+
+    if store.count() > 0:
+        df = load_reports(store)
+        center, zoom, bounds = viewport_from_state(st.session_state.get("report_map"), DEFAULT_CENTER, DEFAULT_ZOOM)
+        index = services.get_map_index(df, load_landfills(LANDFILL_DATA_FILE))
+        visible, _ = index.visible(bounds)
+        shown = df.iloc[visible]
+        m = folium.Map(location=DEFAULT_CENTER, zoom_start=DEFAULT_ZOOM)
+
+        fg = folium.FeatureGroup(name="Reports")
+        popups = None if aggregates(len(shown), zoom) else generate_popups(with_details(store, shown))
+        add_point_layer(fg, shown["lat"], shown["lon"], "red", radius=10, popups=popups, zoom=zoom)
+        st_folium(m, width=700, key="report_map", center=center, zoom=zoom, feature_group_to_add=fg,
+                  returned_objects=["bounds", "zoom", "center"])
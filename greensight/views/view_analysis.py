@@ -0,0 +1,126 @@
+import folium
+import pandas as pd
+import streamlit as st
+from streamlit_folium import st_folium
+from streamlit_geolocation import streamlit_geolocation
+
+from data_loader import load_reports, load_landfills, with_details
+from forecasting import forecast_cells, FORECAST_CELL_DEG
+from greensight import services
+from greensight.config import ADDRESS_PENDING, DEFAULT_CENTER, DEFAULT_ZOOM, LANDFILL_DATA_FILE
+from heatmap import add_heatmap_layer
+from map_layers import add_point_layer, aggregates, generate_popups
+from thumbnails import ensure_thumbnail
+from viewport import viewport_from_state, pad_bounds
+
+LEGEND = """
+    This map visualizes different types of waste pollution hotspots using color-coded markers:
+
+    - 🟦 **Blue**: Detected *illegal garbage dumps* — reported or suspected based on analysis.
+    - 🔴 **Red**: *Pollution-prone zones* — areas showing signs of concentrated waste accumulation or likely risk zones.
+    - 🟩 **Green**: *Registered dump locations* — verified data from the official government waste management database.
+    - 🟧 **Orange squares** (optional): *Predicted hotspots* — areas the forecast model expects to get new reports next week.
+
+    Use this tool to explore problem areas and compare community reports with government-registered sites. Data-driven insights can help target clean-up efforts and improve waste management strategies.
+    """
+
+
+# YYYYMMDD report date as YYYY-MM-DD.
+def format_report_date(date):
+    date = str(date)
+    return f"{date[:4]}-{date[4:6]}-{date[6:]}"
+
+
+# One red circle per hotspot from the cluster summary, radius capped at 5 km.
+def add_hotspot_circles(fg, clusters):
+    for cluster in clusters.itertuples():
+        folium.Circle(
+            location=[cluster.lat, cluster.lon],
+            radius=min(cluster.max_radius_km * 1000, 5000),  # limit radius to 5km
+            color="red",
+            fill=True,
+            fill_opacity=0.2
+        ).add_to(fg)
+
+
+# Orange squares for the published forecast cells, shaded by risk.
+def add_forecast_cells(fg, forecast, cell_deg):
+    half = cell_deg / 2
+    for cell in forecast.itertuples():
+        folium.Rectangle(
+            bounds=[[cell.cell_lat - half, cell.cell_lon - half], [cell.cell_lat + half, cell.cell_lon + half]],
+            color="orange",
+            weight=1,
+            fill=True,
+            fill_opacity=0.6 * cell.risk,
+            tooltip=f"Risk next week: {cell.risk:.0%}",
+        ).add_to(fg)
+
+
+def render():
+    st.header("Waste Pollution Hotspot Analysis")
+    st.markdown(LEGEND)
+    store = services.get_report_store()
+    services.get_geocode_queue()
+    if store.count() == 0:
+        st.warning("No data to analyze yet.")
+        st.stop()
+
+    df = load_reports(store)
+    dumps = load_landfills(LANDFILL_DATA_FILE)
+    location = streamlit_geolocation()
+    if location is None:
+        st.error("Unable to retrieve your geolocation. Please ensure location access is enabled and try again.")
+        st.stop()
+
+    labels, clusters = services.hotspots_for(df)
+
+    center, zoom, bounds = viewport_from_state(st.session_state.get("analysis_map"), DEFAULT_CENTER, DEFAULT_ZOOM)
+    index = services.get_map_index(df, dumps)
+    visible, visible_dumps = index.visible(bounds)
+    shown = df.iloc[visible]
+    m = folium.Map(location=DEFAULT_CENTER, zoom_start=DEFAULT_ZOOM)
+    fg = folium.FeatureGroup(name="Analysis")
+
+    show_heatmap = st.checkbox("Show report density heatmap")
+    if show_heatmap:
+        # Pre-binned density cells for this zoom level instead of one marker per report
+        density_grid = services.get_density_grid()
+        density_grid.update(df)
+        add_heatmap_layer(fg, *density_grid.cells(zoom, pad_bounds(bounds)), zoom=zoom)
+    else:
+        # Plot individual markers; only what is inside the viewport
+        popups = None if aggregates(len(shown), zoom) else generate_popups(with_details(store, shown))
+        add_point_layer(fg, shown["lat"], shown["lon"], "blue", radius=3, popups=popups, zoom=zoom)
+    shown_dumps = dumps.iloc[visible_dumps]
+    add_point_layer(fg, shown_dumps["LATITUDE"], shown_dumps["LONGITUDE"], "green", radius=3, zoom=zoom)
+
+    # Risk per grid cell is precomputed by the offline forecast job (python forecasting.py train)
+    if st.checkbox("Show predicted hotspots for next week"):
+        forecast = forecast_cells(store, pad_bounds(bounds), min_risk=0.2)
+        if store.get_meta("forecast:trained_at") is None:
+            st.info("No forecast available yet. Run `python forecasting.py train` to build one.")
+        elif forecast.empty:
+            st.caption("No area in view is predicted to get new reports next week.")
+        add_forecast_cells(fg, forecast, float(store.get_meta("forecast:cell_deg", FORECAST_CELL_DEG)))
+
+    # Plot hotspots based on clustering, from the precomputed cluster summary
+    add_hotspot_circles(fg, clusters)
+    st_folium(m, width=700, key="analysis_map", center=center, zoom=zoom, feature_group_to_add=fg,
+              returned_objects=["bounds", "zoom", "center"])
+
+    analyze_pins_button = st.button("Analyze Pins")
+    if analyze_pins_button:
+        st.subheader("Pin Information")
+        for row in with_details(store, df).itertuples(index=False):
+            address = row.address if pd.notna(row.address) else ADDRESS_PENDING
+            st.write(f"**Date:** {format_report_date(row.date)}")
+            st.write(f"**Description:** {row.description}")
+            st.write(f"**Coordinates:** ({row.lat:.5f}, {row.lon:.5f})")
+            st.write(f"**Address:** {address}")
+            if row.sightings > 1:
+                st.write(f"**Sightings:** {row.sightings}")
+            thumb = ensure_thumbnail(row.image if pd.notna(row.image) else "")
+            if thumb:
+                st.image(thumb, width=200)
+            st.write("---")
@@ -0,0 +1,93 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from folium.plugins import HeatMap
+
+from coordinates import coordinate_arrays
+
+# Zoom levels that get their own density grid; other zooms use the nearest one.
+HEATMAP_MIN_ZOOM = 3
+HEATMAP_MAX_ZOOM = 16
+# Approximate screen size of one density cell.
+HEATMAP_CELL_PX = 8
+
+
+def heatmap_cell_size(zoom, cell_px=HEATMAP_CELL_PX):
+    return 360.0 / (256 * 2 ** zoom) * cell_px
+
+
+# Report counts binned into lat/lon cells, one grid per zoom level. Levels are
+# built lazily with vectorized histogramming of the shared report frame's
+# coordinate arrays the first time they are viewed, and then kept current by
+# binning only the reports added since the last update.
+class DensityGrid:
+    def __init__(self, min_zoom=HEATMAP_MIN_ZOOM, max_zoom=HEATMAP_MAX_ZOOM):
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.last_id = 0
+        self._lats, self._lons = coordinate_arrays([], [])
+        self._levels = {}
+        self._lock = threading.Lock()
+
+    def _bin(self, zoom, lats, lons):
+        cell = heatmap_cell_size(zoom)
+        n_cols = int(np.ceil(360.0 / cell))
+        rows = np.floor((np.asarray(lats, dtype=np.float64) + 90.0) / cell).astype(np.int64)
+        cols = np.floor((np.asarray(lons, dtype=np.float64) + 180.0) / cell).astype(np.int64) % n_cols
+        keys, counts = np.unique(rows * n_cols + cols, return_counts=True)
+        return pd.Series(counts, index=keys, dtype=np.int64)
+
+    def _add(self, zoom, lats, lons):
+        if lats.size:
+            grid = self._levels.get(zoom)
+            binned = self._bin(zoom, lats, lons)
+            self._levels[zoom] = binned if grid is None else grid.add(binned, fill_value=0).astype(np.int64)
+
+    # Bin the reports in the frame (ordered by id, as load_reports returns it) added
+    # since the last call into every level built so far, and keep its coordinate
+    # arrays for levels built later. A frame older than the last one is ignored.
+    def update(self, reports):
+        ids = reports["id"].to_numpy()
+        with self._lock:
+            if ids.size == 0 or ids[-1] < self.last_id:
+                return 0
+            self._lats, self._lons = coordinate_arrays(reports["lat"], reports["lon"])
+            start = np.searchsorted(ids, self.last_id, side="right")
+            for zoom in self._levels:
+                self._add(zoom, self._lats[start:], self._lons[start:])
+            self.last_id = int(ids[-1])
+            return ids.size - start
+
+    def _level(self, zoom):
+        zoom = int(min(max(round(zoom), self.min_zoom), self.max_zoom))
+        with self._lock:
+            if zoom not in self._levels:
+                self._levels[zoom] = pd.Series(dtype=np.int64)
+                self._add(zoom, self._lats, self._lons)
+            return zoom, self._levels[zoom]
+
+    # Cell centres and report counts for the non-empty cells inside bounds
+    # (lat_min, lat_max, lon_min, lon_max) at the given zoom.
+    def cells(self, zoom, bounds):
+        zoom, grid = self._level(zoom)
+        cell = heatmap_cell_size(zoom)
+        n_cols = int(np.ceil(360.0 / cell))
+        keys = grid.index.to_numpy()
+        lats = (keys // n_cols + 0.5) * cell - 90.0
+        lons = (keys % n_cols + 0.5) * cell - 180.0
+        lat_min, lat_max, lon_min, lon_max = bounds
+        in_lon = (lons >= lon_min) & (lons <= lon_max) if lon_min <= lon_max else (lons >= lon_min) | (lons <= lon_max)
+        keep = (lats >= lat_min) & (lats <= lat_max) & in_lon
+        return lats[keep], lons[keep], grid.to_numpy()[keep]
+
+
+# Add the visible density cells to a map (or feature group) as a Leaflet heatmap.
+def add_heatmap_layer(m, lats, lons, counts, zoom):
+    if len(counts) == 0:
+        return None
+    weights = np.asarray(counts, dtype=np.float64) / np.max(counts)
+    data = np.column_stack([np.round(lats, 6), np.round(lons, 6), np.round(weights, 4)]).tolist()
+    layer = HeatMap(data, radius=HEATMAP_CELL_PX * 2, blur=HEATMAP_CELL_PX * 2, min_opacity=0.3, max_zoom=zoom)
+    layer.add_to(m)
+    return layer
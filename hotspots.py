@@ -0,0 +1,253 @@
+import math
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.neighbors import BallTree
+
+from spatial_index import GridIndex, haversine, EARTH_RADIUS_KM
+
+# DBSCAN parameters used by the hotspot views (eps in radians, ~3.2 km).
+HOTSPOT_EPS = 0.0005
+HOTSPOT_MIN_SAMPLES = 5
+# When a batch of new reports is larger than this fraction of the whole dataset, a
+# full recompute is cheaper than updating point by point.
+FULL_RECOMPUTE_FRACTION = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hotspots (
+    report_id INTEGER PRIMARY KEY,
+    label INTEGER NOT NULL,
+    neighbors INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_hotspots_label ON hotspots (label);
+"""
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+# DBSCAN hotspot labels persisted next to the reports. update() only looks at the
+# eps-neighbourhood of reports added since the last run (incremental DBSCAN
+# insertion), so keeping hotspots current costs O(new reports); recompute() runs
+# the full clustering and is meant as an offline job.
+class HotspotEngine:
+    def __init__(self, store, eps=HOTSPOT_EPS, min_samples=HOTSPOT_MIN_SAMPLES):
+        self.store = store
+        self.eps = eps
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        with store.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _params(self):
+        return f"{self.eps}:{self.min_samples}"
+
+    # Bring labels up to date with the report table; returns the number of reports
+    # that were clustered.
+    def update(self):
+        with self._lock:
+            last_id = int(self.store.get_meta("hotspots:last_id", 0))
+            new = self._reports("WHERE id > ?", (last_id,))
+            if new.empty:
+                return 0
+            total = self.store.count()
+            if (last_id == 0 or self.store.get_meta("hotspots:params") != self._params()
+                    or len(new) > FULL_RECOMPUTE_FRACTION * total):
+                return self._recompute()
+            self._insert(new)
+            return len(new)
+
+    # Full DBSCAN over every report, replacing the stored labels.
+    def recompute(self):
+        with self._lock:
+            return self._recompute()
+
+    # Cluster label per report id; reports outside any hotspot are -1.
+    def labels(self, report_ids):
+        rows = self.store.connection().execute("SELECT report_id, label FROM hotspots WHERE label != -1").fetchall()
+        clustered = pd.Series(dict(rows), dtype="int64")
+        return pd.Series(report_ids).map(clustered).fillna(-1).astype("int64").to_numpy()
+
+    def _reports(self, where="", params=()):
+        return pd.read_sql_query(f"SELECT id, lat, lon FROM reports {where} ORDER BY id",
+                                 self.store.connection(), params=params)
+
+    def _recompute(self):
+        df = self._reports()
+        if df.empty:
+            return 0
+        coords = np.radians(df[["lat", "lon"]].to_numpy())
+        labels = DBSCAN(eps=self.eps, min_samples=self.min_samples, metric="haversine").fit(coords).labels_
+        neighbors = BallTree(coords, metric="haversine").query_radius(coords, self.eps, count_only=True)
+        with self.store.connection() as conn:
+            conn.execute("DELETE FROM hotspots")
+            conn.executemany(
+                "INSERT INTO hotspots (report_id, label, neighbors) VALUES (?, ?, ?)",
+                zip(df["id"].tolist(), labels.tolist(), neighbors.tolist()),
+            )
+        self._save_meta(int(df["id"].max()), int(labels.max()) + 1)
+        self.store.set_meta("hotspots:params", self._params())
+        return len(df)
+
+    def _save_meta(self, last_id, next_label):
+        self.store.set_meta("hotspots:last_id", last_id)
+        self.store.set_meta("hotspots:next_label", max(next_label, 0))
+
+    # Stored reports (with their hotspot state) inside a lat/lon box around the
+    # given points, wide enough to hold the neighbours of their neighbours.
+    def _local_region(self, lats, lons):
+        margin = 2 * math.degrees(self.eps)
+        lon_margin = margin / max(math.cos(math.radians(max(abs(lats.min()), abs(lats.max())) + margin)), 0.01)
+        return pd.read_sql_query(
+            "SELECT r.id, r.lat, r.lon, h.label, h.neighbors FROM reports r "
+            "JOIN hotspots h ON h.report_id = r.id "
+            "WHERE r.lat BETWEEN ? AND ? AND r.lon BETWEEN ? AND ?",
+            self.store.connection(),
+            params=(lats.min() - margin, lats.max() + margin, lons.min() - lon_margin, lons.max() + lon_margin),
+        )
+
+    def _insert(self, new):
+        old = self._local_region(new["lat"].to_numpy(), new["lon"].to_numpy())
+        n_old = len(old)
+        ids = np.concatenate([old["id"].to_numpy(), new["id"].to_numpy()])
+        lats = np.concatenate([old["lat"].to_numpy(), new["lat"].to_numpy()])
+        lons = np.concatenate([old["lon"].to_numpy(), new["lon"].to_numpy()])
+        labels = np.concatenate([old["label"].to_numpy(), np.full(len(new), -1)]).astype(np.int64)
+        counts = np.concatenate([old["neighbors"].to_numpy(), np.zeros(len(new))]).astype(np.int64)
+        was_core = counts >= self.min_samples
+
+        index = GridIndex(lats, lons, cell_deg=math.degrees(self.eps))
+        new_idx = np.arange(n_old, len(ids))
+        new_neighbors = [index.query_radius(lats[i], lons[i], self.eps)[0] for i in new_idx]
+        changed = set(new_idx.tolist())
+        for i, hood in zip(new_idx, new_neighbors):
+            counts[i] = len(hood)
+            counts[hood[hood < n_old]] += 1
+            changed.update(hood[hood < n_old].tolist())
+        core = counts >= self.min_samples
+
+        # Cores created by this batch connect every core in their neighbourhood.
+        seeds = np.flatnonzero(core & ~was_core)
+        uf = _UnionFind()
+        seed_neighbors = [index.query_radius(lats[c], lons[c], self.eps)[0] for c in seeds]
+        for c, hood in zip(seeds, seed_neighbors):
+            uf.find(c)
+            for q in hood[core[hood]]:
+                uf.union(c, q)
+
+        components = {}
+        for c in list(uf.parent):
+            components.setdefault(uf.find(c), []).append(c)
+        # Existing clusters joined through a component are merged into the lowest label.
+        label_uf = _UnionFind()
+        for members in components.values():
+            existing = [int(labels[m]) for m in members if labels[m] != -1]
+            for label in existing:
+                label_uf.union(existing[0], label)
+        roots = {}
+        for label in list(label_uf.parent):
+            root = label_uf.find(label)
+            roots[root] = min(roots.get(root, label), label)
+        merged = {label: roots[label_uf.find(label)] for label in label_uf.parent
+                  if roots[label_uf.find(label)] != label}
+        if merged:
+            labels = np.array([merged.get(int(label), int(label)) for label in labels], dtype=np.int64)
+
+        next_label = int(self.store.get_meta("hotspots:next_label", 0))
+        for members in components.values():
+            existing = [int(labels[m]) for m in members if labels[m] != -1]
+            if existing:
+                target = existing[0]
+            else:
+                target = next_label
+                next_label += 1
+            for m in members:
+                if labels[m] != target:
+                    labels[m] = target
+                    changed.add(m)
+
+        # Border points: noise within eps of a seed core joins its cluster, and a new
+        # non-core report joins the cluster of any core it falls next to.
+        for c, hood in zip(seeds, seed_neighbors):
+            for q in hood:
+                if labels[q] == -1:
+                    labels[q] = labels[c]
+                    changed.add(q)
+        for i, hood in zip(new_idx, new_neighbors):
+            if not core[i] and labels[i] == -1:
+                core_hood = hood[core[hood]]
+                if len(core_hood):
+                    labels[i] = labels[core_hood[0]]
+
+        with self.store.connection() as conn:
+            # Clusters joined by this batch also have members outside the local region.
+            conn.executemany("UPDATE hotspots SET label = ? WHERE label = ?",
+                             [(target, label) for label, target in merged.items()])
+            conn.executemany(
+                "INSERT OR REPLACE INTO hotspots (report_id, label, neighbors) VALUES (?, ?, ?)",
+                [(int(ids[i]), int(labels[i]), int(counts[i])) for i in sorted(changed)],
+            )
+        self._save_meta(int(new["id"].max()), next_label)
+
+
+# One row per hotspot (noise label -1 excluded), indexed by label and sorted by
+# size: spherical centroid (mean of unit vectors, so clusters near the poles or the
+# antimeridian stay correct), report count, distance in km from the centroid to
+# the farthest member, and the lat/lon bounding box (plain min/max, so a box across
+# the antimeridian spans the whole width). Everything is computed for all
+# clusters at once.
+def cluster_summary(lats, lons, labels):
+    lats, lons, labels = (np.asarray(v) for v in (lats, lons, labels))
+    columns = ["lat", "lon", "count", "max_radius_km", "lat_min", "lat_max", "lon_min", "lon_max"]
+    keep = labels != -1
+    if not keep.any():
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="label"))
+    lats, lons = lats[keep].astype(np.float64), lons[keep].astype(np.float64)
+    names, idx = np.unique(labels[keep], return_inverse=True)
+    n = names.size
+    phi, lam = np.radians(lats), np.radians(lons)
+    x = np.bincount(idx, np.cos(phi) * np.cos(lam), n)
+    y = np.bincount(idx, np.cos(phi) * np.sin(lam), n)
+    z = np.bincount(idx, np.sin(phi), n)
+    c_lat = np.degrees(np.arctan2(z, np.hypot(x, y)))
+    c_lon = np.degrees(np.arctan2(y, x))
+    radius = np.zeros(n)
+    np.maximum.at(radius, idx, haversine(lats, lons, c_lat[idx], c_lon[idx]) * EARTH_RADIUS_KM)
+    bounds = pd.DataFrame({"lat": lats, "lon": lons}).groupby(idx).agg(["min", "max"]).to_numpy()
+    summary = pd.DataFrame({
+        "lat": c_lat,
+        "lon": c_lon,
+        "count": np.bincount(idx, minlength=n),
+        "max_radius_km": radius,
+        "lat_min": bounds[:, 0],
+        "lat_max": bounds[:, 1],
+        "lon_min": bounds[:, 2],
+        "lon_max": bounds[:, 3],
+    }, index=pd.Index(names, name="label"))
+    return summary.sort_values("count", ascending=False, kind="stable")
+
+if __name__ == "__main__":
+    # Usage: python hotspots.py recompute [waste_reports.db] -- offline full clustering
+    from report_store import ReportStore, REPORTS_DB
+    if len(sys.argv) < 2 or sys.argv[1] != "recompute":
+        print("usage: python hotspots.py recompute [db_path]")
+        sys.exit(1)
+    engine = HotspotEngine(ReportStore(sys.argv[2] if len(sys.argv) > 2 else REPORTS_DB))
+    print(f"Clustered {engine.recompute()} reports")
@@ -0,0 +1,270 @@
+import argparse
+import base64
+import binascii
+import csv
+import hashlib
+import hmac
+import json
+import math
+import os
+import shutil
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from coordinates import COORD_DECIMALS, check_coordinates
+from dedupe import image_hash
+
+INGEST_BATCH_SIZE = 5000
+INGEST_HOST = "127.0.0.1"
+INGEST_PORT = 8765
+# Largest request body the HTTP endpoint accepts.
+INGEST_MAX_BODY = 64 * 1024 * 1024
+# Bearer token the HTTP endpoint requires; it refuses to start without one.
+INGEST_TOKEN_ENV = "GREENSIGHT_INGEST_TOKEN"
+IMAGE_DIR = "images"
+MAX_DESCRIPTION_LENGTH = 500
+_DATE_FORMATS = ("%Y%m%d", "%Y-%m-%d", "%Y/%m/%d")
+
+
+class IngestError(ValueError):
+    pass
+
+
+# YYYYMMDD integer from an int/str date in one of the accepted formats (or an ISO
+# timestamp).
+def parse_date(value):
+    if value is None or value == "":
+        raise IngestError("missing date")
+    text = str(value).strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return int(datetime.strptime(text, fmt).strftime("%Y%m%d"))
+        except ValueError:
+            pass
+    try:
+        return int(datetime.fromisoformat(text).strftime("%Y%m%d"))
+    except ValueError:
+        raise IngestError(f"unrecognised date {value!r}") from None
+
+
+def _coordinate(record, *names):
+    for name in names:
+        if record.get(name) not in (None, ""):
+            try:
+                value = float(record[name])
+            except (TypeError, ValueError):
+                raise IngestError(f"{name} is not a number: {record[name]!r}") from None
+            if not math.isfinite(value):
+                raise IngestError(f"{name} is not finite")
+            return value
+    raise IngestError(f"missing {names[0]}")
+
+
+# Copy or decode a record's image into images/, named by content hash so the same
+# photo sent twice is stored once. Returns the stored path, or "" without an image.
+# `image` paths name files on this machine and are only followed when allow_paths
+# is set (the CLI); over HTTP only image_base64 is accepted.
+def store_image(record, image_dir=IMAGE_DIR, allow_paths=True):
+    if record.get("image") and not allow_paths:
+        raise IngestError("image paths are not accepted here; send the photo as image_base64")
+    if record.get("image_base64"):
+        try:
+            data = base64.b64decode(record["image_base64"], validate=True)
+        except (binascii.Error, ValueError):
+            raise IngestError("image_base64 is not valid base64") from None
+        source = None
+    elif record.get("image"):
+        source = str(record["image"])
+        if not os.path.isfile(source):
+            raise IngestError(f"image not found: {source}")
+        with open(source, "rb") as f:
+            data = f.read()
+    else:
+        return ""
+    path = os.path.join(image_dir, hashlib.sha256(data).hexdigest()[:32] + ".jpg")
+    if not os.path.exists(path):
+        os.makedirs(image_dir, exist_ok=True)
+        if source is None:
+            with open(path, "wb") as f:
+                f.write(data)
+        else:
+            shutil.copyfile(source, path)
+        try:
+            from thumbnails import make_thumbnail
+            make_thumbnail(path)
+        except OSError:
+            os.remove(path)
+            raise IngestError("image could not be read") from None
+    return path
+
+
+# One partner record as a (lat, lon, date, description, image, image_hash) row for
+# the store. Coordinates are signed WGS84 degrees (lat/lon or latitude/longitude)
+# and are range-checked; raises IngestError for records that cannot be stored.
+def normalize_record(record, image_dir=IMAGE_DIR, allow_paths=True):
+    if not isinstance(record, dict):
+        raise IngestError("record is not an object")
+    lat = _coordinate(record, "lat", "latitude")
+    lon = _coordinate(record, "lon", "longitude", "lng")
+    try:
+        check_coordinates(lat, lon)
+    except ValueError as e:
+        raise IngestError(str(e)) from None
+    date = parse_date(record.get("date"))
+    description = " ".join(str(record.get("description") or "").split())[:MAX_DESCRIPTION_LENGTH]
+    image = store_image(record, image_dir, allow_paths)
+    return (round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), date, description, image,
+            image_hash(image) if image else None)
+
+
+def _dedupe_key(row):
+    lat, lon, date, description = row[:4]
+    return lat, lon, date, description.lower()
+
+
+# Keys of the stored reports that could collide with the given rows.
+def _existing_keys(store, rows):
+    dates = [row[2] for row in rows]
+    lats = [row[0] for row in rows]
+    found = store.connection().execute(
+        "SELECT lat, lon, date, description FROM reports WHERE date BETWEEN ? AND ? AND lat BETWEEN ? AND ?",
+        (min(dates), max(dates), min(lats), max(lats)),
+    ).fetchall()
+    return {(round(lat, COORD_DECIMALS), round(lon, COORD_DECIMALS), date, (description or "").lower())
+            for lat, lon, date, description in found}
+
+
+# Validate, normalize and dedupe one batch of records (against itself and the
+# store) and write the survivors in a single transaction. Returns a summary with
+# the rejected records' positions and reasons.
+def ingest_batch(store, records, image_dir=IMAGE_DIR, allow_paths=True):
+    rows, rejected = [], []
+    for i, record in enumerate(records):
+        try:
+            rows.append(normalize_record(record, image_dir, allow_paths))
+        except IngestError as e:
+            rejected.append({"index": i, "error": str(e)})
+    seen = _existing_keys(store, rows) if rows else set()
+    fresh = []
+    for row in rows:
+        key = _dedupe_key(row)
+        if key not in seen:
+            seen.add(key)
+            fresh.append(row)
+    store.add_many(fresh)
+    return {"received": len(records), "inserted": len(fresh), "duplicates": len(rows) - len(fresh),
+            "rejected": rejected}
+
+
+# Each batch bumps the store version once; hotspot labels are left to the app's
+# background job, which sees the new version and updates them under its own lock.
+def ingest(store, records, batch_size=INGEST_BATCH_SIZE, image_dir=IMAGE_DIR, allow_paths=True):
+    total = {"received": 0, "inserted": 0, "duplicates": 0, "rejected": []}
+    for start in range(0, len(records), batch_size):
+        summary = ingest_batch(store, records[start:start + batch_size], image_dir, allow_paths)
+        for key in ("received", "inserted", "duplicates"):
+            total[key] += summary[key]
+        total["rejected"] += [{**r, "index": r["index"] + start} for r in summary["rejected"]]
+    return total
+
+
+# Records from a partner file: CSV (with a header row), a JSON array or
+# {"reports": [...]}, or newline-delimited JSON.
+def read_records(path):
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            return [json.loads(line) for line in f if line.strip()]
+        return _records_from_json(json.load(f))
+
+
+def _records_from_json(payload):
+    if isinstance(payload, dict):
+        payload = payload.get("reports")
+    if not isinstance(payload, list):
+        raise IngestError('expected a list of reports or {"reports": [...]}')
+    return payload
+
+
+# POST /reports with a JSON body and the bearer token; replies with the ingest
+# summary.
+class IngestHandler(BaseHTTPRequestHandler):
+    store = None
+    token = None
+    batch_size = INGEST_BATCH_SIZE
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/reports":
+            return self._reply(404, {"error": "not found"})
+        given = self.headers.get("Authorization") or ""
+        if not self.token or not hmac.compare_digest(given.encode(), f"Bearer {self.token}".encode()):
+            return self._reply(401, {"error": "unauthorized"})
+        length = self.headers.get("Content-Length")
+        if length is None:
+            return self._reply(411, {"error": "Content-Length required"})
+        if not (length.isascii() and length.strip().isdigit()):
+            return self._reply(400, {"error": "invalid Content-Length"})
+        length = int(length)
+        if length > INGEST_MAX_BODY:
+            return self._reply(413, {"error": "request too large"})
+        try:
+            records = _records_from_json(json.loads(self.rfile.read(length) or b"null"))
+        except (ValueError, IngestError) as e:
+            return self._reply(400, {"error": str(e)})
+        self._reply(200, ingest(self.store, records, self.batch_size, allow_paths=False))
+
+
+def serve(store, host=INGEST_HOST, port=INGEST_PORT, batch_size=INGEST_BATCH_SIZE, token=None):
+    token = token or os.environ.get(INGEST_TOKEN_ENV)
+    if not token:
+        raise ValueError(f"set {INGEST_TOKEN_ENV} to the token partners must send before serving")
+    handler = type("Handler", (IngestHandler,),
+                   {"store": store, "token": token, "batch_size": batch_size})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Accepting reports on http://{host}:{port}/reports")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    from report_store import ReportStore, REPORTS_DB
+    parser = argparse.ArgumentParser(description="Bulk-ingest partner waste reports.")
+    parser.add_argument("--db", default=REPORTS_DB)
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="ingest CSV, JSON or NDJSON files")
+    load.add_argument("files", nargs="+")
+    server = commands.add_parser("serve", help="run the local HTTP endpoint")
+    server.add_argument("--host", default=INGEST_HOST)
+    server.add_argument("--port", type=int, default=INGEST_PORT)
+    args = parser.parse_args()
+    store = ReportStore(args.db)
+    if args.command == "serve":
+        try:
+            serve(store, args.host, args.port, args.batch_size)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        for path in args.files:
+            start = time.perf_counter()
+            summary = ingest(store, read_records(path), args.batch_size)
+            print(f"{path}: {summary['inserted']:,} inserted, {summary['duplicates']:,} duplicates, "
+                  f"{len(summary['rejected']):,} rejected of {summary['received']:,} "
+                  f"in {time.perf_counter() - start:.2f} s")
+            for r in summary["rejected"][:20]:
+                print(f"  record {r['index']}: {r['error']}")
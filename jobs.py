@@ -0,0 +1,102 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = 2
+# Finished jobs kept (with their results) so repeated requests are served from cache.
+JOB_RESULTS_KEPT = 32
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# One unit of background work. progress(done, total) may be called by the task
+# while it runs; pages read status/progress/result when they rerun.
+class Job:
+    def __init__(self, job_id, key, label):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.status = QUEUED
+        self.done_count = 0
+        self.total = 0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._finished = threading.Event()
+
+    def progress(self, done, total):
+        self.done_count, self.total = done, total
+
+    def fraction(self):
+        return self.done_count / self.total if self.total else 0.0
+
+    def finished(self):
+        return self._finished.is_set()
+
+    # Block for up to `timeout` seconds; True if the job has finished.
+    def wait(self, timeout=None):
+        return self._finished.wait(timeout)
+
+
+# In-process job system shared by all sessions. Jobs are identified by a key that
+# includes everything the result depends on (e.g. the data version), so a request
+# for a key that is already queued, running or finished returns that same job
+# instead of starting the work again. Failed jobs are not cached.
+class JobRunner:
+    def __init__(self, max_workers=JOB_WORKERS, keep=JOB_RESULTS_KEPT):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._by_key = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # Run fn(*args, **kwargs) in the background. With report_progress=True the job's
+    # progress callback is passed to fn as `progress=`.
+    def submit(self, key, fn, *args, label="", report_progress=False, **kwargs):
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is not None and job.status != FAILED:
+                return job
+            job = Job(next(self._ids), key, label)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            self._evict()
+        if report_progress:
+            kwargs["progress"] = job.progress
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = RUNNING
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = DONE
+        except Exception as e:
+            job.error = e
+            job.status = FAILED
+        job.finished_at = time.time()
+        job._finished.set()
+
+    # Drop the oldest finished jobs beyond the retention limit; queued and running
+    # jobs are always kept.
+    def _evict(self):
+        finished = [job for job in self._jobs.values() if job.finished()]
+        for job in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
@@ -0,0 +1,154 @@
+import json
+
+import numpy as np
+from branca.element import Element, MacroElement
+from jinja2 import Template
+
+from thumbnails import ensure_thumbnail, thumbnail_url
+
+# Below this zoom level point layers are aggregated into grid cells on the server
+# before being sent to the browser.
+CLUSTER_MAX_ZOOM = 10
+# Layers smaller than this are always drawn as individual points.
+CLUSTER_MIN_POINTS = 500
+
+_BIND_POPUP = """
+function(feature, layer) {
+    if (feature.properties && feature.properties.popup) {
+        layer.bindPopup(feature.properties.popup, {maxWidth: 300});
+    }
+}
+"""
+
+_BIND_COUNT = """
+function(feature, layer) {
+    layer.bindTooltip(feature.properties.count + " reports");
+    layer.setRadius(Math.min(4 + 3 * Math.log2(feature.properties.count), 30));
+}
+"""
+
+
+# Whether a layer of n points is drawn as grid-aggregated counts at this zoom.
+def aggregates(n_points, zoom):
+    return zoom is not None and zoom < CLUSTER_MAX_ZOOM and n_points >= CLUSTER_MIN_POINTS
+
+
+# Grid cell size (degrees) used for aggregation at a given zoom: roughly 64 screen
+# pixels per cell, since a 256px tile spans 360 / 2**zoom degrees.
+def cell_size_for_zoom(zoom):
+    return 360.0 / (2 ** zoom) / 4
+
+
+# Bin points into square lat/lon cells. Returns the mean position and count of the
+# points in every non-empty cell.
+def grid_aggregate(lats, lons, cell_deg):
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    if lats.size == 0:
+        return lats, lons, np.zeros(0, dtype=np.int64)
+    rows = np.floor((lats + 90.0) / cell_deg).astype(np.int64)
+    cols = np.floor((lons + 180.0) / cell_deg).astype(np.int64)
+    keys = rows * (int(360.0 / cell_deg) + 1) + cols
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    cell_lats = np.bincount(inverse, weights=lats) / counts
+    cell_lons = np.bincount(inverse, weights=lons) / counts
+    return cell_lats, cell_lons, counts
+
+
+# GeoJSON FeatureCollection of points; extra per-point properties are given as
+# equal-length sequences keyed by property name.
+def point_features(lats, lons, **properties):
+    lats = np.round(np.asarray(lats, dtype=np.float64), 6).tolist()
+    lons = np.round(np.asarray(lons, dtype=np.float64), 6).tolist()
+    names = list(properties)
+    columns = [list(properties[name]) for name in names]
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {name: column[i] for name, column in zip(names, columns)},
+        }
+        for i, (lat, lon) in enumerate(zip(lats, lons))
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Script element emitted verbatim. folium normally wraps each rendered script in a
+# new jinja Template, which means re-lexing the whole embedded dataset on every render.
+class _RawScript(Element):
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+
+    def render(self, **kwargs):
+        return self.script
+
+
+# A whole point dataset as one Leaflet GeoJSON layer drawn with circle markers.
+class PointLayer(MacroElement):
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.geoJson({{ this.data_json }}, {
+                pointToLayer: function(feature, latlng) {
+                    return L.circleMarker(latlng, {{ this.marker_options }});
+                },
+                onEachFeature: {{ this.on_each_feature }}
+            }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+        """)
+
+    def __init__(self, data, marker_options, on_each_feature=None):
+        super().__init__()
+        self._name = "PointLayer"
+        # "</" is escaped so popup HTML can never close the surrounding <script> tag.
+        self.data_json = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+        self.marker_options = json.dumps(marker_options)
+        self.on_each_feature = on_each_feature or "null"
+
+    def render(self, **kwargs):
+        figure = self.get_root()
+        figure.script.add_child(_RawScript(self._template.module.script(self, kwargs)), name=self.get_name())
+
+
+# Add a whole set of points to the map as one GeoJSON layer instead of one
+# folium.CircleMarker per row. When the map is zoomed out past CLUSTER_MAX_ZOOM,
+# points are grid-aggregated server-side and drawn as sized count markers.
+def add_point_layer(m, lats, lons, color, radius=3, popups=None, zoom=None):
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    marker = {"radius": radius, "color": color, "fill": True, "fillColor": color, "fillOpacity": 0.4}
+
+    if aggregates(lats.size, zoom):
+        cell_lats, cell_lons, counts = grid_aggregate(lats, lons, cell_size_for_zoom(zoom))
+        layer = PointLayer(point_features(cell_lats, cell_lons, count=counts.tolist()), marker, _BIND_COUNT)
+    elif popups is not None:
+        layer = PointLayer(point_features(lats, lons, popup=popups), marker, _BIND_POPUP)
+    else:
+        layer = PointLayer(point_features(lats, lons), marker)
+    layer.add_to(m)
+    return layer
+
+
+# Generate popups for map (used only for the Report Incident and View Analysis pages).
+# Builds the HTML for every report at once with vectorized string operations.
+def generate_popups(df):
+    date_str = df["date"].astype(str)
+    popups = (
+        "<strong>Date:</strong> " + date_str.str[:4] + "-" + date_str.str[4:6] + "-" + date_str.str[6:] + "<br>"
+        + "<strong>Description:</strong> " + df["description"].fillna("").astype(str) + "<br>"
+        + "<strong>Coordinates:</strong> (" + df["lat"].astype(str) + ", " + df["lon"].astype(str) + ")<br>"
+    )
+    if "sightings" in df:
+        repeated = df["sightings"] > 1
+        popups[repeated] += "<strong>Sightings:</strong> " + df.loc[repeated, "sightings"].astype(str) + "<br>"
+    # Images are referenced by thumbnail URL; the browser only fetches one when its
+    # popup is opened, so no image bytes are embedded in the page.
+    if "image" in df:
+        images = df["image"].fillna("").astype(str)
+        urls = {}
+        for idx, path in images[images != ""].items():
+            if path not in urls:
+                urls[path] = thumbnail_url(path) if ensure_thumbnail(path) else None
+            if urls[path] is not None:
+                popups[idx] += f'<img src="{urls[path]}" loading="lazy" width="200"><br>'
+    return popups.tolist()
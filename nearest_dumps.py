@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+from spatial_index import EARTH_RADIUS_KM
+
+
+# Prebuilt haversine BallTree over reported dumps and registered landfill sites,
+# answering top-k nearest queries without scanning every row. Build once per data
+# version (see get_dump_finder in greensight/services.py) and reuse across reruns.
+# Report descriptions are only looked up, through describe(ids), for the sites a
+# query returns; without describe they are taken from a description column.
+class DumpFinder:
+    def __init__(self, reports, landfills, describe=None):
+        self.describe = describe
+        self.n_reports = len(reports)
+        self.ids = reports["id"].to_numpy()
+        self.dates = reports["date"].to_numpy()
+        self.names = None if describe else reports["description"].fillna("").astype(str).to_numpy()
+        self.landfill_names = landfills["SITE_NAME"].fillna("").astype(str).to_numpy()
+        self.lats = np.concatenate([reports["lat"].to_numpy(dtype=np.float64),
+                                    landfills["LATITUDE"].to_numpy(dtype=np.float64)])
+        self.lons = np.concatenate([reports["lon"].to_numpy(dtype=np.float64),
+                                    landfills["LONGITUDE"].to_numpy(dtype=np.float64)])
+        self.tree = BallTree(np.radians(np.column_stack([self.lats, self.lons])), metric="haversine") \
+            if self.lats.size else None
+
+    def __len__(self):
+        return self.lats.size
+
+    # The k sites closest to (lat, lon), nearest first, as a DataFrame with source,
+    # lat, lon, date (reports only), name and distance_km columns.
+    def nearest(self, lat, lon, k=5):
+        k = min(k, len(self))
+        idx, dist = np.zeros(0, dtype=np.int64), np.zeros(0)
+        if k > 0:
+            dist, idx = self.tree.query(np.radians([[lat, lon]]), k=k)
+            dist, idx = dist[0], idx[0]
+        reported = idx < self.n_reports
+        rows = idx[reported]
+        names = np.empty(idx.size, dtype=object)
+        if self.describe is None:
+            names[reported] = self.names[rows]
+        elif rows.size:
+            found = self.describe(self.ids[rows]).to_dict()
+            names[reported] = [found.get(i) or "" for i in self.ids[rows].tolist()]
+        names[~reported] = self.landfill_names[idx[~reported] - self.n_reports]
+        dates = np.full(idx.size, pd.NA, dtype=object)
+        dates[reported] = self.dates[rows]
+        return pd.DataFrame({
+            "source": np.where(reported, "Reported dump", "Registered landfill"),
+            "lat": self.lats[idx],
+            "lon": self.lons[idx],
+            "date": dates,
+            "name": names,
+            "distance_km": dist * EARTH_RADIUS_KM,
+        })
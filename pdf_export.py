@@ -0,0 +1,110 @@
+import sys
+import time
+
+from fpdf import FPDF
+
+# (header, column width in mm) of the exported report table.
+PDF_COLUMNS = [("lat", 40), ("lon", 40), ("date", 40), ("description", 120)]
+PDF_ROW_HEIGHT = 10
+PDF_FONT_SIZE = 15
+# Rows fetched from the store per round trip while writing the table.
+PDF_CHUNK_SIZE = 5000
+# Rough character budget for the description column at PDF_FONT_SIZE.
+_DESCRIPTION_CHARS = 45
+
+
+# Output buffer for FPDF. fpdf 1.7 appends every PDF line with
+# `self.buffer += line`, which copies the whole document each time and makes large
+# exports quadratic; this collects the lines and only joins them once at the end.
+class _Buffer:
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+
+    def __iadd__(self, text):
+        self.parts.append(text)
+        self.length += len(text)
+        return self
+
+    def __len__(self):
+        return self.length
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+# A3 portrait report table that repeats the column headers on every page.
+class ReportPDF(FPDF):
+    def __init__(self):
+        super().__init__(orientation="P", unit="mm", format=(297, 420))
+        self.set_auto_page_break(True, margin=15)
+        self.buffer = _Buffer()
+
+    def header(self):
+        self.set_font("Arial", style="B", size=PDF_FONT_SIZE)
+        for title, width in PDF_COLUMNS:
+            self.cell(width, PDF_ROW_HEIGHT, title, border=1)
+        self.ln()
+        self.set_font("Arial", size=PDF_FONT_SIZE)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font("Arial", size=10)
+        self.cell(0, 8, f"Page {self.page_no()}", align="C")
+
+
+# fpdf's core fonts only cover Latin-1.
+def _latin1(text):
+    return str(text).encode("latin-1", "replace").decode("latin-1")
+
+
+def _row_cells(lat, lon, date, description):
+    date_str = str(date)
+    description = "" if description is None else _latin1(description)
+    if len(description) > _DESCRIPTION_CHARS:
+        description = description[:_DESCRIPTION_CHARS - 3] + "..."
+    return [str(lat), str(lon), f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}", description]
+
+
+# Write every report to a paginated PDF and return its bytes. Rows are streamed
+# from the store in chunks instead of materializing the whole table first;
+# progress(done, total) is called after each chunk.
+def export_reports_pdf(store, chunk_size=PDF_CHUNK_SIZE, progress=None):
+    pdf = ReportPDF()
+    pdf.add_page()
+    total = store.count()
+    widths = [width for _, width in PDF_COLUMNS]
+    cursor = store.connection().execute("SELECT lat, lon, date, description FROM reports ORDER BY id")
+    done = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for row in rows:
+            for width, text in zip(widths, _row_cells(*row)):
+                pdf.cell(width, PDF_ROW_HEIGHT, text, border=1)
+            pdf.ln()
+        done += len(rows)
+        if progress is not None:
+            progress(done, total)
+    return pdf.output(dest="S").getvalue().encode("latin-1")
+
+
+def _benchmark(n):
+    import os
+    import tempfile
+    from report_store import ReportStore
+    store = ReportStore(os.path.join(tempfile.mkdtemp(), "bench.db"))
+    store.add_many((43.65 + i * 1e-6, 79.38, 20250408, f"report {i}", "") for i in range(n))
+    t = time.perf_counter()
+    data = export_reports_pdf(store)
+    elapsed = time.perf_counter() - t
+    print(f"{n:,} rows -> {len(data) / 1e6:.1f} MB PDF in {elapsed:.2f} s ({n / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    # Usage: python pdf_export.py bench [rows] -- export throughput on synthetic reports
+    if len(sys.argv) < 2 or sys.argv[1] != "bench":
+        print("usage: python pdf_export.py bench [rows]")
+        sys.exit(1)
+    _benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
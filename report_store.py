@@ -0,0 +1,420 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from spatial_index import haversine, EARTH_RADIUS_KM
+
+REPORTS_DB = "waste_reports.db"
+# Rows converted per step when loading typed columns.
+LOAD_CHUNK_ROWS = 100_000
+REPORT_COLUMNS = ["lat", "lon", "date", "description", "image"]
+# Per-report text kept out of the shared in-memory frame and read for the rows a
+# page actually shows (see ReportStore.details).
+REPORT_DETAIL_COLUMNS = ["description", "image", "address"]
+EVENT_COLUMNS = ["date", "time", "lat", "lon", "description", "access_features", "special_requirements"]
+# Tables whose rows carry a reverse-geocoded address filled in after insert.
+ADDRESS_TABLES = ("reports", "events")
+# Coordinate convention of the stored rows, recorded in meta by the migration.
+COORDINATE_MODEL = "wgs84"
+# How close (in degrees) a report must be to an event's position for the event to
+# be taken as organized at that report when migrating.
+_EVENT_MATCH_DEG = 0.05
+# Known signed WGS84 sites that decide the sign of legacy report longitudes, and
+# how near one must be to a position for it to count as agreeing with it.
+LEGACY_ANCHORS_FILE = "large_landfills.csv"
+_SIGN_MATCH_KM = 100.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    date INTEGER NOT NULL,
+    description TEXT,
+    image TEXT,
+    address TEXT,
+    sightings INTEGER NOT NULL DEFAULT 1,
+    last_seen INTEGER,
+    image_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reports_lat_lon ON reports (lat, lon);
+CREATE INDEX IF NOT EXISTS idx_reports_date ON reports (date);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    time TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    description TEXT,
+    access_features TEXT,
+    special_requirements TEXT,
+    address TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_date ON events (date);
+CREATE INDEX IF NOT EXISTS idx_events_feed ON events (date, time, id);
+CREATE INDEX IF NOT EXISTS idx_events_lat_lon ON events (lat, lon);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+# Embedded SQLite (WAL mode) store for waste reports and cleanup events. Writes go through a single
+# transaction per call, so concurrent submitters can never interleave partial rows
+# the way appending to the CSV could.
+class ReportStore:
+    def __init__(self, path=REPORTS_DB):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+        # Migrations run under the write lock and re-read the schema and markers
+        # inside it, so two processes opening an old store migrate it only once.
+        with self.writing() as conn:
+            # Stores created before addresses were geocoded at ingest time.
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(reports)")]
+            if "address" not in columns:
+                conn.execute("ALTER TABLE reports ADD COLUMN address TEXT")
+            # ... and before repeat sightings of a report were merged into it.
+            if "sightings" not in columns:
+                conn.execute("ALTER TABLE reports ADD COLUMN sightings INTEGER NOT NULL DEFAULT 1")
+                conn.execute("ALTER TABLE reports ADD COLUMN last_seen INTEGER")
+                conn.execute("ALTER TABLE reports ADD COLUMN image_hash TEXT")
+            if self._get_meta(conn, "coordinates") != COORDINATE_MODEL:
+                self._migrate_coordinates(conn)
+
+    # Stores written before coordinates were canonical hold report longitudes in both
+    # conventions (the Report Incident form stored -lon, other writers signed
+    # degrees), and events organized at a report or hotspot copied them. Reports are
+    # flipped to signed WGS84 where only the mirrored position agrees with the anchor
+    # sites (see _legacy_signs); the rest are kept, and those neither position
+    # settles are listed (see unresolved_coordinates). An event is then taken to be
+    # negated when only its mirrored position has reports nearby. Flipped rows had
+    # their addresses looked up at the mirrored positions, so they are cleared to be
+    # geocoded again, and the rollup trigger is dropped so the regions are rebuilt.
+    def _migrate_coordinates(self, conn):
+        found = np.array(conn.execute("SELECT id, lat, lon FROM reports").fetchall(), dtype=np.float64).reshape(-1, 3)
+        signs = _legacy_signs(found[:, 1], found[:, 2], _anchor_sites())
+        conn.execute(
+            "UPDATE reports SET lon = -lon, address = NULL WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(found[signs < 0, 0].astype(np.int64).tolist()),),
+        )
+        self._add_unresolved(conn, found[signs == 0, 0].astype(np.int64).tolist())
+        near = ("EXISTS (SELECT 1 FROM reports r WHERE r.lat BETWEEN events.lat - :d AND events.lat + :d "
+                "AND r.lon BETWEEN {lon} - :d AND {lon} + :d)")
+        conn.execute(
+            f"UPDATE events SET lon = -lon, address = NULL WHERE lon != 0 "
+            f"AND {near.format(lon='-events.lon')} AND NOT {near.format(lon='events.lon')}",
+            {"d": _EVENT_MATCH_DEG},
+        )
+        conn.execute("DROP TRIGGER IF EXISTS reports_rollup")
+        self._set_meta(conn, "coordinates", COORDINATE_MODEL)
+        self._bump_changes(conn, "reports")
+        self._bump_changes(conn, "events")
+        self._bump_version(conn)
+
+    # One connection per thread; Streamlit serves every session on its own thread.
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # The calling thread's connection, for modules that keep derived tables (e.g.
+    # hotspot labels) in the same database.
+    def connection(self):
+        return self._connect()
+
+    # Record report ids whose longitude sign could not be decided when migrating or
+    # importing legacy rows; they were stored as written.
+    def _add_unresolved(self, conn, ids):
+        if ids:
+            known = json.loads(self._get_meta(conn, "coordinates:unresolved", "[]"))
+            self._set_meta(conn, "coordinates:unresolved", json.dumps(sorted(set(known + ids))))
+
+    # Ids of legacy reports kept as written because neither sign of their longitude
+    # agreed with the anchor sites, for someone to check by hand.
+    def unresolved_coordinates(self):
+        return json.loads(self.get_meta("coordinates:unresolved", "[]"))
+
+    # One write transaction holding SQLite's write lock from the start (BEGIN
+    # IMMEDIATE), so whatever is read inside it still holds when it commits.
+    @contextmanager
+    def writing(self):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            yield conn
+
+    def _bump_version(self, conn, key="version"):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (key,),
+        )
+
+    # Record an in-place change to existing rows of a table (see data_key).
+    def _bump_changes(self, conn, table):
+        self._bump_version(conn, "changes:" + table)
+
+    # A consistent view of the store across several reads (one SQLite read
+    # transaction), e.g. a version or data key and the rows it describes.
+    @contextmanager
+    def reading(self):
+        conn = self._connect()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+
+    # Monotonic counter bumped on every write of report or event rows (not on
+    # geocoded addresses); used to invalidate derived caches.
+    def version(self):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    # Identity of the rows of a table: its highest id (rows are only ever appended)
+    # and the number of in-place changes such as merged sightings or migrations.
+    # Unlike the version it ignores other tables and geocoded addresses.
+    def data_key(self, table):
+        if table not in ADDRESS_TABLES:
+            raise ValueError(f"unknown table: {table}")
+        conn = self._connect()
+        max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+        return f"{max_id}:{self._get_meta(conn, 'changes:' + table, 0)}"
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def add(self, lat, lon, date, description="", image="", image_hash=None):
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO reports (lat, lon, date, description, image, image_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                (float(lat), float(lon), int(date), description, image, image_hash),
+            )
+            self._bump_version(conn)
+        return cur.lastrowid
+
+    # Bulk insert of (lat, lon, date, description, image) rows in one transaction,
+    # each optionally followed by the image's hash (see dedupe.image_hash).
+    def add_many(self, rows):
+        with self._connect() as conn:
+            return self._insert_reports(conn, rows)
+
+    def _insert_reports(self, conn, rows):
+        rows = [
+            (float(lat), float(lon), int(date), description, image, image_hash[0] if image_hash else None)
+            for lat, lon, date, description, image, *image_hash in rows
+        ]
+        if rows:
+            conn.executemany(
+                "INSERT INTO reports (lat, lon, date, description, image, image_hash) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._bump_version(conn)
+        return len(rows)
+
+    # Record another sighting of an existing report: bump its count and last-seen
+    # date, and keep the new photo (and its hash) only if the report had none.
+    # Returns the new count.
+    def add_sighting(self, report_id, date, image="", image_hash=None):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE reports SET sightings = sightings + 1, last_seen = MAX(COALESCE(last_seen, date), ?), "
+                "image = CASE WHEN COALESCE(image, '') = '' THEN ? ELSE image END, "
+                "image_hash = CASE WHEN COALESCE(image, '') = '' AND COALESCE(?, '') != '' THEN ? "
+                "ELSE image_hash END WHERE id = ?",
+                (int(date), image, image, image_hash, report_id),
+            )
+            self._bump_changes(conn, "reports")
+            self._bump_version(conn)
+            row = conn.execute("SELECT sightings FROM reports WHERE id = ?", (report_id,)).fetchone()
+        return row[0] if row else 0
+
+    # All reports as a DataFrame with the columns of the old CSV plus the report id,
+    # its geocoded address (None until the background geocoder has filled it in) and
+    # how many times it has been reported; or just the given columns. Given dtypes,
+    # rows are fetched and converted a chunk at a time, so the whole table never
+    # exists as Python row tuples at once.
+    def load(self, columns=None, dtypes=None):
+        columns = columns or ["id", "lat", "lon", "date", "description", "image", "address", "sightings"]
+        query = f"SELECT {', '.join(columns)} FROM reports ORDER BY id"
+        if dtypes is None:
+            return pd.read_sql_query(query, self._connect())
+        cursor = self._connect().execute(query)
+        parts = []
+        while rows := cursor.fetchmany(LOAD_CHUNK_ROWS):
+            parts.append(pd.DataFrame.from_records(rows, columns=columns).astype(dtypes))
+        if not parts:
+            return pd.DataFrame({c: pd.Series(dtype=dtypes.get(c, object)) for c in columns})
+        return pd.concat(parts, ignore_index=True)
+
+    # Detail columns of the given reports as a DataFrame indexed by id. The ids are
+    # passed as one JSON parameter, so any number can be looked up in one query.
+    def details(self, ids, columns=REPORT_DETAIL_COLUMNS):
+        rows = self._connect().execute(
+            f"SELECT id, {', '.join(columns)} FROM reports WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([int(i) for i in ids]),),
+        ).fetchall()
+        return pd.DataFrame.from_records(rows, columns=["id", *columns], index="id")
+
+    def add_event(self, date, time, lat, lon, description="", access_features="", special_requirements=""):
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO events (date, time, lat, lon, description, access_features, special_requirements) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(date), str(time), float(lat), float(lon), description, access_features, special_requirements),
+            )
+            self._bump_version(conn)
+        return cur.lastrowid
+
+    def load_events(self):
+        return pd.read_sql_query(
+            "SELECT id, date, time, lat, lon, description, access_features, special_requirements, address "
+            "FROM events ORDER BY id",
+            self._connect(),
+        )
+
+    # Rows of a table that still need a geocoded address, as (id, lat, lon).
+    def missing_addresses(self, table):
+        if table not in ADDRESS_TABLES:
+            raise ValueError(f"unknown table: {table}")
+        return self._connect().execute(f"SELECT id, lat, lon FROM {table} WHERE address IS NULL").fetchall()
+
+    # Write resolved addresses back, given {row_id: address}. Addresses are read per
+    # row when shown and are not part of any derived data, so the version is left
+    # alone.
+    def set_addresses(self, table, addresses):
+        if table not in ADDRESS_TABLES:
+            raise ValueError(f"unknown table: {table}")
+        if not addresses:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                f"UPDATE {table} SET address = ? WHERE id = ?",
+                [(address, row_id) for row_id, address in addresses.items()],
+            )
+
+    def _get_meta(self, conn, key, default=None):
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def get_meta(self, key, default=None):
+        return self._get_meta(self._connect(), key, default)
+
+    def set_meta(self, key, value):
+        with self._connect() as conn:
+            self._set_meta(conn, key, value)
+
+    def _set_meta(self, conn, key, value):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, str(value)),
+        )
+
+    # One-shot import of a legacy waste_reports.csv. Returns the number of rows
+    # imported, or 0 if this file was already imported into the store.
+    def import_csv(self, csv_path, force=False):
+        marker = "imported:" + os.path.abspath(csv_path)
+        if not os.path.exists(csv_path) or (self.get_meta(marker) and not force):
+            return 0
+        df = pd.read_csv(csv_path, names=REPORT_COLUMNS, header=0, skipinitialspace=True)
+        df = df.dropna(subset=["lat", "lon", "date"])
+        df["description"] = df["description"].fillna("").astype(str)
+        df["image"] = df["image"].fillna("").astype(str)
+        # The marker is re-checked and written in the same transaction as the rows,
+        # so concurrent imports of one file cannot both insert it.
+        with self.writing() as conn:
+            if self._get_meta(conn, marker) and not force:
+                return 0
+            # The legacy CSV mixes negated and signed longitudes; the store's events
+            # are already signed and serve as anchors too.
+            events = np.array(conn.execute("SELECT lat, lon FROM events").fetchall(), dtype=np.float64).reshape(-1, 2)
+            signs = _legacy_signs(df["lat"], df["lon"], np.concatenate([_anchor_sites(), events]))
+            df.loc[signs < 0, "lon"] = -df.loc[signs < 0, "lon"]
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM reports").fetchone()[0]
+            imported = self._insert_reports(conn, df[REPORT_COLUMNS].itertuples(index=False, name=None))
+            ids = [row[0] for row in conn.execute("SELECT id FROM reports WHERE id > ? ORDER BY id", (last_id,))]
+            self._add_unresolved(conn, [ids[i] for i in np.flatnonzero(signs == 0)])
+            self._set_meta(conn, marker, imported)
+        return imported
+
+    # One-shot import of a legacy cleanup_events.csv, same semantics as import_csv.
+    def import_events_csv(self, csv_path, force=False):
+        marker = "imported:" + os.path.abspath(csv_path)
+        if not os.path.exists(csv_path) or (self.get_meta(marker) and not force):
+            return 0
+        df = pd.read_csv(csv_path, names=EVENT_COLUMNS, header=0, dtype=str)
+        df = df.dropna(subset=["date", "lat", "lon"]).fillna("")
+        rows = [
+            (r.date, r.time, float(r.lat), float(r.lon), r.description, r.access_features, r.special_requirements)
+            for r in df.itertuples(index=False)
+        ]
+        with self.writing() as conn:
+            if self._get_meta(conn, marker) and not force:
+                return 0
+            if rows:
+                conn.executemany(
+                    "INSERT INTO events (date, time, lat, lon, description, access_features, special_requirements) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._bump_version(conn)
+            self._set_meta(conn, marker, len(rows))
+        return len(rows)
+
+
+
+# (lat, lon) of the anchor sites as an (n, 2) array, empty without the file.
+def _anchor_sites(path=LEGACY_ANCHORS_FILE):
+    if not os.path.exists(path):
+        return np.zeros((0, 2))
+    df = pd.read_csv(path, usecols=["LATITUDE", "LONGITUDE"]).dropna()
+    return df.to_numpy(dtype=np.float64)
+
+
+# Sign to apply to each legacy longitude: -1 where only the mirrored position
+# (lat, -lon) has an anchor within _SIGN_MATCH_KM, 1 where only the position as
+# written has one (or lon is 0), and 0 where neither or both do.
+def _legacy_signs(lats, lons, anchors):
+    lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+    signs = np.where(lons == 0, 1, 0).astype(np.int8)
+    if anchors.size == 0:
+        return signs
+    for start in range(0, lats.size, LOAD_CHUNK_ROWS):
+        part = slice(start, start + LOAD_CHUNK_ROWS)
+        lat, lon = lats[part, None], lons[part, None]
+        as_written = (haversine(lat, lon, anchors[:, 0], anchors[:, 1]) * EARTH_RADIUS_KM <= _SIGN_MATCH_KM).any(axis=1)
+        mirrored = (haversine(lat, -lon, anchors[:, 0], anchors[:, 1]) * EARTH_RADIUS_KM <= _SIGN_MATCH_KM).any(axis=1)
+        signs[part] = np.where(lons[part] == 0, 1, as_written.astype(np.int8) - mirrored)
+    return signs
+
+
+if __name__ == "__main__":
+    # Usage: python report_store.py import|import-events [csv_path] [db_path]
+    if len(sys.argv) < 2 or sys.argv[1] not in ("import", "import-events"):
+        print("usage: python report_store.py import|import-events [csv_path] [db_path]")
+        sys.exit(1)
+    events = sys.argv[1] == "import-events"
+    csv_path = sys.argv[2] if len(sys.argv) > 2 else ("cleanup_events.csv" if events else "waste_reports.csv")
+    db_path = sys.argv[3] if len(sys.argv) > 3 else REPORTS_DB
+    store = ReportStore(db_path)
+    n = store.import_events_csv(csv_path) if events else store.import_csv(csv_path)
+    print(f"Imported {n} {'events' if events else 'reports'} from {csv_path} into {db_path}")
+    unresolved = store.unresolved_coordinates()
+    if unresolved:
+        print(f"{len(unresolved)} reports kept as written; their longitude sign is unknown: {unresolved}")
@@ -0,0 +1,81 @@
+import pandas as pd
+
+ROLLUP_PERIODS = ("day", "week", "month")
+
+# Report dates are stored as YYYYMMDD integers; these SQL expressions turn one into
+# the ISO start date of its day, week (Monday) and month. date() yields NULL for
+# malformed values, which are then left out of the rollups.
+_DAY = "date(printf('%04d-%02d-%02d', {d} / 10000, {d} / 100 % 100, {d} % 100))"
+_PERIOD_START = {
+    "day": _DAY,
+    "week": "date(" + _DAY + ", '-6 days', 'weekday 1')",
+    "month": "date(" + _DAY + ", 'start of month')",
+}
+# Regions are 1-degree lat/lon cells named by their south-west corner.
+_FLOOR = "(CAST({v} AS INTEGER) - ({v} < CAST({v} AS INTEGER)))"
+_REGION = "printf('%d,%d', " + _FLOOR.format(v="{lat}") + ", " + _FLOOR.format(v="{lon}") + ")"
+
+_TABLE = """
+CREATE TABLE IF NOT EXISTS report_rollups (
+    period TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    region TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (period, period_start, region)
+);
+"""
+
+
+def _upsert(period, date, lat, lon, source=""):
+    start = _PERIOD_START[period].format(d=date)
+    region = _REGION.format(lat=lat, lon=lon)
+    return (
+        f"INSERT INTO report_rollups (period, period_start, region, count) "
+        f"SELECT '{period}', {start}, {region}, COUNT(*) {source} "
+        f"WHERE {start} IS NOT NULL "
+        + ("GROUP BY 2, 3 " if source else "")
+        + "ON CONFLICT (period, period_start, region) DO UPDATE SET count = count + excluded.count;"
+    )
+
+
+# Create the rollup table, backfill it from existing reports once, and install a
+# trigger so every later insert (single, bulk or imported) updates the counts in
+# the same transaction. The trigger is checked again under the write lock, so
+# processes starting together on a fresh store backfill it only once.
+def ensure_rollups(store):
+    if _has_trigger(store.connection()):
+        return
+    with store.writing() as conn:
+        if _has_trigger(conn):
+            return
+        conn.execute(_TABLE)
+        conn.execute("DELETE FROM report_rollups")
+        for period in ROLLUP_PERIODS:
+            conn.execute(_upsert(period, "date", "lat", "lon", source="FROM reports"))
+        body = "\n".join(_upsert(period, "NEW.date", "NEW.lat", "NEW.lon") for period in ROLLUP_PERIODS)
+        conn.execute(f"CREATE TRIGGER reports_rollup AFTER INSERT ON reports BEGIN\n{body}\nEND")
+
+
+def _has_trigger(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'reports_rollup'").fetchone()
+
+
+# Report counts per period as a Series with a DatetimeIndex, optionally for one
+# region only.
+def rollup_counts(store, period="day", region=None):
+    query = "SELECT period_start, SUM(count) FROM report_rollups WHERE period = ?"
+    params = [period]
+    if region is not None:
+        query += " AND region = ?"
+        params.append(region)
+    rows = store.connection().execute(query + " GROUP BY period_start ORDER BY period_start", params).fetchall()
+    index = pd.DatetimeIndex([pd.Timestamp(start) for start, _ in rows], name="date")
+    return pd.Series([count for _, count in rows], index=index, name="reports", dtype="int64")
+
+
+# Regions with at least one report, busiest first.
+def rollup_regions(store):
+    rows = store.connection().execute(
+        "SELECT region FROM report_rollups WHERE period = 'month' GROUP BY region ORDER BY SUM(count) DESC"
+    ).fetchall()
+    return [region for region, in rows]
@@ -0,0 +1,91 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "feather": ".feather"}
+# Schema metadata key recording the data version a snapshot was taken from.
+_VERSION_KEY = b"greensight_source_version"
+
+
+def snapshot_path(name, fmt="parquet", directory=SNAPSHOT_DIR):
+    return os.path.join(directory, name + SNAPSHOT_FORMATS[fmt])
+
+
+# Write a DataFrame as a compressed Parquet (zstd) or Feather (lz4) file, tagged
+# with the version of the data it was built from.
+def write_snapshot(df, path, source_version):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _VERSION_KEY: str(source_version).encode()})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    if path.endswith(".feather"):
+        feather.write_feather(table, tmp, compression="lz4")
+    else:
+        pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, path)
+    return path
+
+
+def snapshot_version(path):
+    if not os.path.exists(path):
+        return None
+    # pyarrow is only imported once a snapshot exists, so plain loads skip it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if path.endswith(".feather"):
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+    else:
+        schema = pq.read_schema(path)
+    return (schema.metadata or {}).get(_VERSION_KEY, b"").decode() or None
+
+
+# Snapshot of `name` taken from exactly `source_version`, as a DataFrame, or None
+# if there is no such snapshot (missing or stale). Parquet is preferred.
+def read_fresh_snapshot(name, source_version, columns=None, directory=SNAPSHOT_DIR):
+    for fmt in SNAPSHOT_FORMATS:
+        path = snapshot_path(name, fmt, directory)
+        if snapshot_version(path) == str(source_version):
+            if fmt == "feather":
+                import pyarrow.feather as feather
+                return feather.read_feather(path, columns=columns)
+            return pd.read_parquet(path, columns=columns)
+    return None
+
+
+# Snapshot reports, cleanup events and the full landfill dataset. Returns the
+# written paths. Store tables are tagged with their data key (see
+# ReportStore.data_key), read in the same transaction as the rows.
+def write_all(store, landfill_path, fmt="parquet", directory=SNAPSHOT_DIR):
+    from data_loader import file_signature
+    with store.reading():
+        reports, reports_key = store.load(), store.data_key("reports")
+        events, events_key = store.load_events(), store.data_key("events")
+    paths = [
+        write_snapshot(reports, snapshot_path("reports", fmt, directory), reports_key),
+        write_snapshot(events, snapshot_path("events", fmt, directory), events_key),
+    ]
+    if os.path.exists(landfill_path):
+        paths.append(write_snapshot(pd.read_csv(landfill_path), snapshot_path("landfills", fmt, directory),
+                                    file_signature(landfill_path)))
+    return paths
+
+
+if __name__ == "__main__":
+    from report_store import ReportStore, REPORTS_DB
+    parser = argparse.ArgumentParser(description="Write columnar snapshots of the GreenSight datasets.")
+    parser.add_argument("--format", choices=list(SNAPSHOT_FORMATS), default="parquet")
+    parser.add_argument("--out", default=SNAPSHOT_DIR)
+    parser.add_argument("--db", default=REPORTS_DB)
+    parser.add_argument("--landfills", default="large_landfills.csv")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    for path in write_all(ReportStore(args.db), args.landfills, args.format, args.out):
+        print(f"{path}  {os.path.getsize(path) / 1024:,.1f} KiB")
+    print(f"done in {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,142 @@
+import math
+import sys
+import time
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+# Great-circle distance in radians between points given in degrees (broadcasts
+# like NumPy); multiply by EARTH_RADIUS_KM for kilometres.
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Expand (starts, ends) slice bounds into one flat array of positions.
+def _ranges(starts, ends):
+    lengths = ends - starts
+    keep = lengths > 0
+    starts, lengths = starts[keep], lengths[keep]
+    if lengths.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+    return offsets + np.arange(lengths.sum())
+
+
+# Fixed-size lat/lon grid over a set of points. Points are sorted by row-major cell
+# key, so every grid row inside a query box is one contiguous slice found with a
+# binary search; candidates are then refined exactly (box bounds or haversine).
+# Supports eps-neighbour (radius), k-nearest and bounding-box viewport queries.
+class GridIndex:
+    def __init__(self, lats, lons, cell_deg=0.05):
+        # float32 input (see coordinates.py) is indexed without a float64 copy
+        lats, lons = np.asarray(lats), np.asarray(lons)
+        self.lats = np.ascontiguousarray(lats, dtype=np.result_type(lats.dtype, np.float32))
+        self.lons = np.ascontiguousarray(lons, dtype=np.result_type(lons.dtype, np.float32))
+        self.cell_deg = float(cell_deg)
+        self.n_cols = int(math.ceil(360.0 / self.cell_deg))
+        self.n_rows = int(math.ceil(180.0 / self.cell_deg)) + 1
+        keys = self._rows(self.lats) * self.n_cols + self._cols(self.lons)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def __len__(self):
+        return self.lats.size
+
+    def _rows(self, lats):
+        return np.clip(np.floor((np.asarray(lats) + 90.0) / self.cell_deg), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cols(self, lons):
+        return np.floor((np.asarray(lons) + 180.0) / self.cell_deg).astype(np.int64) % self.n_cols
+
+    # Candidate point indices in the cells overlapping a box; the longitude range may
+    # cross the antimeridian (lon_min > lon_max).
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        rows = np.arange(self._rows(lat_min), self._rows(lat_max) + 1)
+        if lon_max - lon_min >= 360.0:
+            col_ranges = [(0, self.n_cols - 1)]
+        else:
+            c0, c1 = int(self._cols(lon_min)), int(self._cols(lon_max))
+            col_ranges = [(c0, c1)] if c0 <= c1 else [(c0, self.n_cols - 1), (0, c1)]
+        parts = []
+        for c0, c1 in col_ranges:
+            starts = np.searchsorted(self.keys, rows * self.n_cols + c0, side="left")
+            ends = np.searchsorted(self.keys, rows * self.n_cols + c1, side="right")
+            parts.append(self.order[_ranges(starts, ends)])
+        return np.concatenate(parts)
+
+    # Indices of points inside a lat/lon bounding box (e.g. the visible map area).
+    def query_box(self, lat_min, lat_max, lon_min, lon_max):
+        idx = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        lats, lons = self.lats[idx], self.lons[idx]
+        in_lon = (lons >= lon_min) & (lons <= lon_max) if lon_min <= lon_max else (lons >= lon_min) | (lons <= lon_max)
+        return np.sort(idx[(lats >= lat_min) & (lats <= lat_max) & in_lon])
+
+    # Indices of points within `radius` (radians of arc) of a point, and their
+    # distances in radians.
+    def query_radius(self, lat, lon, radius):
+        deg = math.degrees(radius)
+        lat_min, lat_max = max(lat - deg, -90.0), min(lat + deg, 90.0)
+        cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+        if cos_lat < 1e-6 or deg / cos_lat >= 180.0:
+            lon_min, lon_max = -180.0, 180.0
+        else:
+            lon_min = (lon - deg / cos_lat + 180.0) % 360.0 - 180.0
+            lon_max = (lon + deg / cos_lat + 180.0) % 360.0 - 180.0
+        idx = self._candidates(lat_min, lat_max, lon_min, lon_max)
+        dist = haversine(lat, lon, self.lats[idx], self.lons[idx])
+        keep = dist <= radius
+        return idx[keep], dist[keep]
+
+    # The k nearest points to (lat, lon), closest first, with distances in radians.
+    # Searches a growing radius; falls back to a full scan when points are sparse.
+    def nearest(self, lat, lon, k=1):
+        k = min(k, len(self))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        radius = math.radians(self.cell_deg)
+        while radius < math.pi / 4:
+            idx, dist = self.query_radius(lat, lon, radius)
+            if idx.size >= k:
+                top = np.argsort(dist, kind="stable")[:k]
+                return idx[top], dist[top]
+            radius *= 4
+        dist = haversine(lat, lon, self.lats, self.lons)
+        top = np.argsort(dist, kind="stable")[:k]
+        return top, dist[top]
+
+
+def _benchmark(sizes):
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        # City-scale clusters around Toronto plus province-wide background noise.
+        centers = rng.uniform([43.0, -80.5], [44.5, -78.5], size=(200, 2))
+        pts = centers[rng.integers(0, len(centers), n)] + rng.normal(0, 0.02, (n, 2))
+        t = time.perf_counter()
+        index = GridIndex(pts[:, 0], pts[:, 1], cell_deg=math.degrees(0.0005))
+        build = time.perf_counter() - t
+        queries = pts[rng.integers(0, n, 200)]
+        t = time.perf_counter()
+        for lat, lon in queries:
+            index.query_radius(lat, lon, 0.0005)
+        radius = (time.perf_counter() - t) / len(queries)
+        t = time.perf_counter()
+        for lat, lon in queries:
+            index.nearest(lat, lon, k=5)
+        knn = (time.perf_counter() - t) / len(queries)
+        t = time.perf_counter()
+        index.query_box(43.6, 43.75, -79.5, -79.3)
+        box = time.perf_counter() - t
+        t = time.perf_counter()
+        haversine(queries[0, 0], queries[0, 1], pts[:, 0], pts[:, 1])
+        brute = time.perf_counter() - t
+        print(f"n={n:>9,}  build {build * 1e3:8.1f} ms  radius {radius * 1e3:7.3f} ms  "
+              f"knn(5) {knn * 1e3:7.3f} ms  box {box * 1e3:7.3f} ms  brute-force scan {brute * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    # Usage: python spatial_index.py [n ...] -- benchmark build and query times
+    _benchmark([int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000, 3_000_000])
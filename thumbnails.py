@@ -0,0 +1,58 @@
+import os
+import sys
+
+from PIL import Image, ImageOps
+
+# Thumbnails live under Streamlit's static folder so the browser can fetch them by
+# URL (see .streamlit/config.toml) instead of receiving them inlined in the page.
+THUMBNAIL_DIR = os.path.join("static", "thumbnails")
+THUMBNAIL_URL = "/app/static/thumbnails"
+THUMBNAIL_SIZE = (320, 320)
+THUMBNAIL_QUALITY = 70
+
+
+def thumbnail_path(image_path):
+    name = os.path.splitext(os.path.basename(image_path))[0] + ".jpg"
+    return os.path.join(THUMBNAIL_DIR, name)
+
+
+def thumbnail_url(image_path):
+    return f"{THUMBNAIL_URL}/{os.path.basename(thumbnail_path(image_path))}"
+
+
+# Write a compact JPEG thumbnail for an uploaded image and return its path.
+def make_thumbnail(image_path, size=THUMBNAIL_SIZE):
+    dest = thumbnail_path(image_path)
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    with Image.open(image_path) as img:
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(size)
+        img.convert("RGB").save(dest, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return dest
+
+
+# Thumbnail path for an image, creating it first if the original exists but has no
+# thumbnail yet (e.g. reports submitted before thumbnails were introduced).
+# Returns None when there is no usable image.
+def ensure_thumbnail(image_path):
+    if not isinstance(image_path, str) or image_path == "":
+        return None
+    dest = thumbnail_path(image_path)
+    if os.path.exists(dest):
+        return dest
+    if not os.path.exists(image_path):
+        return None
+    try:
+        return make_thumbnail(image_path)
+    except OSError:
+        return None
+
+
+if __name__ == "__main__":
+    # Usage: python thumbnails.py [images_dir] -- backfill thumbnails for existing uploads
+    images_dir = sys.argv[1] if len(sys.argv) > 1 else "images"
+    made = 0
+    for name in sorted(os.listdir(images_dir)):
+        if ensure_thumbnail(os.path.join(images_dir, name)):
+            made += 1
+    print(f"{made} thumbnails available in {THUMBNAIL_DIR}")
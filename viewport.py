@@ -0,0 +1,62 @@
+import math
+
+from coordinates import coordinate_arrays
+from spatial_index import GridIndex
+
+# Size of the st_folium map in pixels, used to estimate the visible area before
+# the browser has reported real bounds.
+MAP_WIDTH_PX = 700
+MAP_HEIGHT_PX = 500
+# Fraction of the viewport added on every side, so short pans stay populated.
+VIEWPORT_PADDING = 0.5
+
+
+# Bounds (lat_min, lat_max, lon_min, lon_max) of a map of the given pixel size
+# centred on `center` at a Leaflet zoom level.
+def bounds_around(center, zoom, width_px=MAP_WIDTH_PX, height_px=MAP_HEIGHT_PX):
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    half_lon = deg_per_px * width_px / 2
+    half_lat = deg_per_px * height_px / 2 * math.cos(math.radians(center[0]))
+    return (max(center[0] - half_lat, -90.0), min(center[0] + half_lat, 90.0),
+            center[1] - half_lon, center[1] + half_lon)
+
+
+# Current viewport from the value st_folium returned on the previous run (kept in
+# st.session_state under the map's key). Falls back to the page's default view,
+# including on st_folium's initial value, whose bounds are all None.
+# Returns (center, zoom, bounds).
+def viewport_from_state(state, default_center, default_zoom):
+    bounds = (state or {}).get("bounds") or {}
+    sw, ne = bounds.get("_southWest") or {}, bounds.get("_northEast") or {}
+    if any(corner.get(k) is None for corner in (sw, ne) for k in ("lat", "lng")):
+        return default_center, default_zoom, bounds_around(default_center, default_zoom)
+    center = state.get("center")
+    if not center or center.get("lat") is None or center.get("lng") is None:
+        center = {"lat": (sw["lat"] + ne["lat"]) / 2, "lng": (sw["lng"] + ne["lng"]) / 2}
+    zoom = state.get("zoom") or default_zoom
+    return [center["lat"], center["lng"]], zoom, (sw["lat"], ne["lat"], sw["lng"], ne["lng"])
+
+
+def pad_bounds(bounds, padding=VIEWPORT_PADDING):
+    lat_min, lat_max, lon_min, lon_max = bounds
+    dlat, dlon = (lat_max - lat_min) * padding, (lon_max - lon_min) * padding
+    if lon_max - lon_min + 2 * dlon >= 360.0:
+        lon_min, lon_max = -180.0, 180.0
+    else:
+        # Leaflet reports unwrapped longitudes past +-180 when the map is panned.
+        lon_min = (lon_min - dlon + 180.0) % 360.0 - 180.0
+        lon_max = (lon_max + dlon + 180.0) % 360.0 - 180.0
+    return max(lat_min - dlat, -90.0), min(lat_max + dlat, 90.0), lon_min, lon_max
+
+
+# Grid indexes over the points drawn on the map pages (reports and landfill sites),
+# so each rerun only sends what is on screen.
+class MapIndex:
+    def __init__(self, report_lats, report_lons, landfill_lats, landfill_lons):
+        self.reports = GridIndex(*coordinate_arrays(report_lats, report_lons), cell_deg=0.05)
+        self.landfills = GridIndex(*coordinate_arrays(landfill_lats, landfill_lons), cell_deg=0.05)
+
+    # Positional indices of the reports and landfills inside the (padded) bounds.
+    def visible(self, bounds):
+        box = pad_bounds(bounds)
+        return self.reports.query_box(*box), self.landfills.query_box(*box)